@@ -0,0 +1,237 @@
+"""
+A script for the binary caching of the uCRM-9 airfoil profiles.
+
+The 21 'uCRM-9_wr*_profile.txt' files are parsed once and stored as a single
+.npy stack of shape (station, coordinate, point). The stack is memory-mapped
+on load and rebuilt automatically when any of the profile files changes.
+
+The cache is written next to the profiles. If that directory is read-only
+(e.g. an installed package), it's written to a user cache directory
+instead, and if that fails too the profiles are parsed in memory.
+
+Advices:
+- You must have a 'Resources/uCRM_9/uCRM_9_Airfoil_Data/' path containing
+the airfoil data
+"""
+import hashlib
+import json
+import os
+import tempfile
+import numpy
+
+AIRFOIL_DIR = 'Resources/uCRM_9/uCRM_9_Airfoil_Data/'
+CACHE_PATH = AIRFOIL_DIR + 'uCRM-9_profiles.npy'
+KEY_PATH = AIRFOIL_DIR + 'uCRM-9_profiles.json'
+
+# The percent of airfoils' Y coordinate
+Y_PERCENT = [0, 10, 15, 20, 25, 30, 35, 37, 40, 45, 50,
+             55, 60, 65, 70, 75, 80, 85, 90, 95, 100]
+
+
+def profile_path(percent):
+    """Path of the text file of the airfoil at the given percent."""
+    return AIRFOIL_DIR + 'uCRM-9_wr%.0f_profile.txt' % percent
+
+
+def profile_path_from_name(name):
+    """Path of the text file of the airfoil given its file name."""
+    return AIRFOIL_DIR + name
+
+
+def user_cache_paths():
+    """
+    It's a function that returns the cache paths in the user cache directory.
+
+    The directory is $XDG_CACHE_HOME (or ~/.cache, %LOCALAPPDATA% on
+    Windows)/pyPDMW/<hash of the airfoil directory>, so that different
+    copies of the data don't share a cache.
+
+    Returns
+    -------
+    cache_path, key_path : Paths of the .npy stack and of its key.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    name = hashlib.sha1(os.path.abspath(AIRFOIL_DIR).encode()).hexdigest()
+    directory = os.path.join(base, 'pyPDMW', name[:16])
+    return (os.path.join(directory, os.path.basename(CACHE_PATH)),
+            os.path.join(directory, os.path.basename(KEY_PATH)))
+
+
+def write_atomic(path, write):
+    """
+    Write a file through a temporary file in the same directory and rename
+    it, so that readers never see a half-written file. write(outfile) writes
+    the content to the binary file object.
+    """
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                         suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as outfile:
+            write(outfile)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+
+def file_digest(path):
+    """Sha1 of a file's content."""
+    with open(path, 'rb') as infile:
+        return hashlib.sha1(infile.read()).hexdigest()
+
+
+def source_key(with_digest=False):
+    """
+    It's a function that describes the current state of the profile files.
+
+    Parameters
+    ----------
+    with_digest : If True, the content hash of each file is included too.
+
+    Returns
+    -------
+    key : List of [file name, size, mtime (ns), sha1 or None] per station.
+    """
+    key = []
+    for percent in Y_PERCENT:
+        path = profile_path(percent)
+        stat = os.stat(path)
+        digest = file_digest(path) if with_digest else None
+        key.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns,
+                    digest])
+    return key
+
+
+def parse_profiles():
+    """
+    It's a function that parses all profiles from the text files.
+
+    Returns
+    -------
+    profiles : Array in the form (Station ID, x/z, Point ID).
+    """
+    profiles = []
+    for percent in Y_PERCENT:
+        with open(profile_path(percent), 'r') as infile:
+            profiles.append(numpy.loadtxt(infile, unpack=True))
+    return numpy.stack(profiles)
+
+
+def build_cache(cache_path=CACHE_PATH, key_path=KEY_PATH, profiles=None):
+    """
+    It's a function that parses all profiles and writes the binary cache.
+
+    The files are written to temporary names and then renamed, so that
+    concurrent readers never see a half-written cache.
+
+    Parameters
+    ----------
+    cache_path, key_path : Paths of the .npy stack and of its key.
+    profiles : The parsed profiles (parse_profiles is called if None).
+
+    Returns
+    -------
+    key : The source key that was stored along with the cache.
+    """
+    if profiles is None:
+        profiles = parse_profiles()
+    key = source_key(with_digest=True)
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    write_atomic(cache_path, lambda outfile: numpy.save(outfile, profiles))
+    write_atomic(key_path, lambda outfile: outfile.write(
+        json.dumps(key).encode()))
+    return key
+
+
+def is_valid(cache_path=CACHE_PATH, key_path=KEY_PATH):
+    """
+    It's a function that checks if the cache matches the profile files.
+
+    Files whose size and mtime are unchanged are trusted. Touched files are
+    compared by content, and the stored key is refreshed if none changed
+    (if the key can't be written, it's checked by content again next time).
+
+    Parameters
+    ----------
+    cache_path, key_path : Paths of the .npy stack and of its key.
+
+    Returns
+    -------
+    valid : True if the cache can be used as is.
+    """
+    if not (os.path.isfile(cache_path) and os.path.isfile(key_path)):
+        return False
+    try:
+        with open(key_path, 'r') as infile:
+            stored = json.load(infile)
+    except (OSError, ValueError):
+        return False
+    current = source_key()
+    if len(stored) != len(current):
+        return False
+
+    touched = False
+    for old, new in zip(stored, current):
+        if old[0] != new[0] or old[1] != new[1]:
+            return False
+        if old[2] != new[2]:
+            if old[3] != file_digest(profile_path_from_name(new[0])):
+                return False
+            old[2] = new[2]
+            touched = True
+    if touched:
+        try:
+            write_atomic(key_path, lambda outfile: outfile.write(
+                json.dumps(stored).encode()))
+        except OSError:
+            pass
+    return True
+
+
+def read_profiles():
+    """
+    It's a function that returns the memory-mapped stack of the profiles.
+
+    The cache next to the profiles is used if it's valid, then the one in
+    the user cache directory. Otherwise the profiles are parsed and the
+    cache is (re)built in the first of the two that is writable.
+
+    Returns
+    -------
+    profiles : Read-only array in the form (Station ID, x/z, Point ID).
+    """
+    locations = [(CACHE_PATH, KEY_PATH), user_cache_paths()]
+    for cache_path, key_path in locations:
+        if is_valid(cache_path, key_path):
+            return numpy.load(cache_path, mmap_mode='r')
+
+    profiles = parse_profiles()
+    for cache_path, key_path in locations:
+        try:
+            build_cache(cache_path, key_path, profiles)
+        except OSError:
+            continue
+        return numpy.load(cache_path, mmap_mode='r')
+    # No writable cache directory, use the parsed profiles
+    profiles.flags.writeable = False
+    return profiles
+
+
+def read_profile(percent):
+    """
+    It's a function that returns a writable copy of one airfoil's profile.
+
+    Parameters
+    ----------
+    percent : The percent of the airfoil's Y coordinate.
+
+    Returns
+    -------
+    x_airfoil, z_airfoil: The normalized coordinates of the airfoil.
+    """
+    profile = numpy.array(read_profiles()[Y_PERCENT.index(percent)])
+    return profile[0], profile[1]
@@ -0,0 +1,318 @@
+"""
+A script that measures how the generation of the .tcl script scales.
+
+The stages of main_oop_with_stringers.py are run over grids of the number of
+ribs, spars and stringers, without HyperMesh and with an in-memory sink. For
+each swept parameter, one value at a time is changed around the reference
+design, and every design is generated `repeat` times with a new StageGraph
+(so nothing is reused). The best time of each stage is kept.
+
+For each swept parameter and stage, the scaling exponent k of the time
+(time ~ N^k, with N the number of ribs, spars or stringers) is fitted on a
+log-log scale. The exponent of the output bytes is fitted as well, so the
+stages that grow faster than the script they write stand out.
+
+The cold start of a worker (a new interpreter that imports the driver and
+generates the reference design) is measured too, in headless mode and with
+the diagnostic plot, see cold_start.
+
+The results are stored in Benchmarks/, one .json file per run named by its
+date and git commit, and compare prints the ratio of the stage times of two
+result files.
+
+Advices:
+- Run it from the pyPDMW directory, like main_oop_with_stringers.py
+- python benchmark_scaling.py [old results .json] runs the benchmark and
+compares it with the old results
+"""
+import dataclasses
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+from main_oop_with_stringers import default_parameters, build_wing
+from stage_graph import StageGraph
+
+BENCHMARK_DIR = 'Benchmarks'
+
+# The program run by cold_start in a new interpreter
+COLD_START_PROGRAM = '''import io, json, sys, time
+tic = time.perf_counter()
+import main_oop_with_stringers as driver
+imported = time.perf_counter()
+parameters, mesh_parameters = driver.default_parameters()
+driver.generate_wing(parameters, mesh_parameters, tcl_path=io.BytesIO())
+generated = time.perf_counter()
+print(json.dumps({'import': imported - tic,
+                  'first_design': generated - imported,
+                  'matplotlib': 'matplotlib' in sys.modules,
+                  'scipy': 'scipy' in sys.modules}))
+'''
+
+# The values of each swept field (the other fields keep their reference
+# values) and the size N of the fitted scaling law
+GRIDS = {'n_ribs_central': [3, 6, 12, 24],
+         'n_ribs_yehudi': [5, 10, 20, 40],
+         'n_ribs_semispan': [10, 20, 40, 80],
+         'n_spars': [2, 3, 5, 8],
+         'n_stringers': [4, 8, 16, 32]}
+SIZES = {'n_ribs_central': 'N_RIBS',
+         'n_ribs_yehudi': 'N_RIBS',
+         'n_ribs_semispan': 'N_RIBS',
+         'n_spars': 'N_SPARS',
+         'n_stringers': 'N_STRINGERS'}
+
+
+def time_design(parameters, mesh_parameters, repeat=3, memory=False):
+    """
+    It's a function that times the stages of one design.
+
+    Parameters
+    ----------
+    parameters, mesh_parameters : The parameters of the design.
+    repeat : Number of runs, the best time of each stage is kept.
+    memory : If True, one more run measures the peak memory of each stage.
+
+    Returns
+    -------
+    result : Dictionary with the best time (and peak memory) of each stage,
+    the total time, the output bytes and the sizes (N_RIBS, ...).
+    """
+    best = {}
+    total = np.inf
+    for _ in range(0, repeat):
+        graph = StageGraph(reuse=False)
+        tic = time.perf_counter()
+        wing = build_wing(parameters, mesh_parameters, graph=graph,
+                          profile=False)
+        total = min(total, time.perf_counter() - tic)
+        for run in graph.runs:
+            best[run['stage']] = min(best.get(run['stage'], np.inf),
+                                     run['time'])
+    result = {'time': total,
+              'bytes': wing.stats['bytes'],
+              'stages': best,
+              'sizes': wing.sizes}
+
+    if memory:
+        graph = StageGraph(reuse=False)
+        wing = build_wing(parameters, mesh_parameters, graph=graph,
+                          profile=True)
+        result['peak_memory'] = {run['stage']: run['peak_memory']
+                                 for run in wing.stages}
+    return result
+
+
+def cold_start(headless=True, repeat=3):
+    """
+    It's a function that measures the cold start of a worker.
+
+    A new interpreter imports the driver and generates the reference design
+    to an in-memory sink, `repeat` times, and the best times are kept.
+
+    Parameters
+    ----------
+    headless : If True, the worker runs in headless mode (see
+    main_oop_with_stringers.headless), else it draws the diagnostic plot
+    (with the non-interactive Agg backend).
+    repeat : Number of new interpreters.
+
+    Returns
+    -------
+    result : Dictionary with the best total wall time (interpreter start
+    included), import time and time of the first design, and whether
+    matplotlib and scipy were imported.
+    """
+    environment = dict(os.environ, PYPDMW_HEADLESS='1' if headless else '0',
+                       MPLBACKEND='Agg')
+    directory = os.path.dirname(os.path.abspath(__file__))
+    result = None
+    for _ in range(0, repeat):
+        tic = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', COLD_START_PROGRAM],
+                                capture_output=True, text=True, check=True,
+                                env=environment, cwd=directory).stdout
+        wall_time = time.perf_counter() - tic
+        run = json.loads(output.splitlines()[-1])
+        run['wall_time'] = wall_time
+        if result is None:
+            result = run
+        else:
+            for key in ('wall_time', 'import', 'first_design'):
+                result[key] = min(result[key], run[key])
+    return result
+
+
+def scaling_exponent(sizes, values):
+    """
+    It's a function that fits values ~ sizes^k on a log-log scale.
+
+    Returns
+    -------
+    k : The exponent, or None if there are less than two usable points.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    values = np.asarray(values, dtype=float)
+    usable = (sizes > 0) & (values > 0)
+    if len(np.unique(sizes[usable])) < 2:
+        return None
+    return float(np.polyfit(np.log(sizes[usable]), np.log(values[usable]),
+                            1)[0])
+
+
+def run_benchmark(grids=None, repeat=3, memory=False):
+    """
+    It's a function that runs the designs of all the grids.
+
+    Parameters
+    ----------
+    grids : Dictionary field -> list of values (GRIDS if None).
+    repeat : Number of runs of each design (see time_design).
+    memory : If True, the peak memory of each stage is measured too.
+
+    Returns
+    -------
+    results : Dictionary with the run info, the cold start of a worker and,
+    for each field, its designs and the fitted exponents of every stage, of
+    the total time and of the output bytes.
+    """
+    if grids is None:
+        grids = GRIDS
+    base_parameters, mesh_parameters = default_parameters()
+    results = {'commit': git_commit(),
+               'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+               'python': platform.python_version(),
+               'numpy': np.__version__,
+               'machine': platform.platform(),
+               'repeat': repeat,
+               'cold_start': {'headless': cold_start(True, repeat),
+                              'plotting': cold_start(False, repeat)},
+               'grids': {}}
+    for field, values in grids.items():
+        designs = []
+        for value in values:
+            parameters = dataclasses.replace(base_parameters,
+                                             **{field: value})
+            design = time_design(parameters, mesh_parameters, repeat, memory)
+            design['value'] = value
+            designs.append(design)
+
+        sizes = [design['sizes'][SIZES[field]] for design in designs]
+        exponents = {stage: scaling_exponent(
+            sizes, [design['stages'][stage] for design in designs])
+            for stage in designs[0]['stages']}
+        exponents['total'] = scaling_exponent(
+            sizes, [design['time'] for design in designs])
+        exponents['bytes'] = scaling_exponent(
+            sizes, [design['bytes'] for design in designs])
+        results['grids'][field] = {'size': SIZES[field],
+                                   'designs': designs,
+                                   'exponents': exponents}
+    return results
+
+
+def git_commit():
+    """The hash of the current git commit, or None outside a git repo."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results, directory=BENCHMARK_DIR):
+    """
+    It's a function that stores the results in a new .json file.
+
+    Returns
+    -------
+    path : Path of the .json file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = time.strftime('%Y%m%d_%H%M%S') + '_' + \
+        (results['commit'] or 'nocommit') + '.json'
+    path = os.path.join(directory, name)
+    with open(path, 'w') as outfile:
+        json.dump(results, outfile, indent=1)
+    return path
+
+
+def load_results(path):
+    """Read the results of a .json file."""
+    with open(path, 'r') as infile:
+        return json.load(infile)
+
+
+def print_exponents(results):
+    """Print the fitted exponents of each grid, stages above 1.5 marked."""
+    for field, grid in results['grids'].items():
+        print(f"{field} (N = {grid['size']}):")
+        for stage, exponent in grid['exponents'].items():
+            if exponent is None:
+                continue
+            flag = '  <-- superlinear' if exponent > 1.5 else ''
+            print(f"    {stage:22s} k = {exponent:5.2f}{flag}")
+
+
+def compare(old, new):
+    """
+    It's a function that compares the stage times of two benchmark results.
+
+    The times of each stage are summed over the designs (grid values) found
+    in both results.
+
+    Parameters
+    ----------
+    old, new : Results (dictionaries or paths of .json files).
+
+    Returns
+    -------
+    ratios : Dictionary field -> stage -> new time / old time.
+    """
+    if not isinstance(old, dict):
+        old = load_results(old)
+    if not isinstance(new, dict):
+        new = load_results(new)
+    ratios = {}
+    for field in old['grids']:
+        if field not in new['grids']:
+            continue
+        old_designs = {design['value']: design['stages']
+                       for design in old['grids'][field]['designs']}
+        new_designs = {design['value']: design['stages']
+                       for design in new['grids'][field]['designs']}
+        values = [value for value in old_designs if value in new_designs]
+        if not values:
+            continue
+        ratios[field] = {}
+        for stage in old_designs[values[0]]:
+            if stage not in new_designs[values[0]]:
+                continue
+            old_time = sum(old_designs[value][stage] for value in values)
+            new_time = sum(new_designs[value][stage] for value in values)
+            ratios[field][stage] = new_time / old_time
+    return ratios
+
+
+if __name__ == '__main__':
+    Results = run_benchmark()
+    for Mode, Start in Results['cold_start'].items():
+        print(f"Worker cold start ({Mode}): {Start['wall_time']:0.2f} s, "
+              f"import {Start['import']:0.2f} s, "
+              f"first design {Start['first_design']:0.2f} s")
+    print_exponents(Results)
+    print('Results in ' + save_results(Results))
+
+    # Compare with older results, if given
+    if len(sys.argv) > 1:
+        Ratios = compare(sys.argv[1], Results)
+        print(f"Time ratios to {sys.argv[1]}:")
+        for Field, Stages in Ratios.items():
+            print(f"{Field}:")
+            for Stage, Ratio in Stages.items():
+                print(f"    {Stage:22s} {Ratio:5.2f}")
@@ -10,22 +10,19 @@ class AssemblyClass:
         self.adjust_normals(file, n_vector)
 
     def write_tcl(self, file):
-        file.write(
-            '*createentity assems name="'
-            + self.name + '"\n')
-        file.write(
-            '*startnotehistorystate {Modified Components of assembly}\n')
         str_ids = ' '.join(map(str, self.components_id))
-        cmd = '*setvalue assems id=%.0f components={comps ' % (self.id)
-        file.write(cmd + str_ids + '}')
         file.write(
+            '*createentity assems name="' + self.name + '"\n'
+            '*startnotehistorystate {Modified Components of assembly}\n'
+            '*setvalue assems id=%.0f components={comps ' % (self.id) +
+            str_ids + '}'
             '\n*endnotehistorystate {Modified Components of assembly}\n')
 
     def adjust_normals(self, file, n_vector):
         names = ' '.join(f'"{w}"' for w in self.components_name)
-        file.write('\n*createmark components 2 ' + names)
-        file.write('\n*createvector 1 ' + n_vector + '\n')
-        file.write('*normalsadjust2 components 2 3 0 0 0 1 50\n\n')
+        file.write('\n*createmark components 2 ' + names +
+                   '\n*createvector 1 ' + n_vector + '\n'
+                   '*normalsadjust2 components 2 3 0 0 0 1 50\n\n')
 
 
 class ComponentClass:
@@ -39,18 +36,14 @@ class ComponentClass:
         self.write_tcl(index, file)
 
     def write_tcl(self, index, file):
-        file.write('*createentity comps name="'
-                   + self.name + '_%.0f"\n'
-                   % (index + 1))
+        name = self.name + '_%.0f' % (index + 1)
+        str_ids = ' '.join(map(str, self.surfaces))
         file.write(
+            '*createentity comps name="' + name + '"\n'
             '*startnotehistorystate {Moved surfaces into component "'
-            + self.name + '_%.0f"}\n' % (index + 1))
-        str_ids = ' '.join(map(str, self.surfaces))
-        file.write("*createmark surfaces 1 " + str_ids)
-        file.write('\n*movemark surfaces 1 "'
-                   + self.name + '_%.0f"\n'
-                   % (index + 1))
-        file.write('*endnotehistorystate {Moved surfaces into component "'
-                   + self.name + '_%.0f"}\n'
-                   % (index + 1))
-        self.name = self.name + '_%.0f' % (index + 1)
+            + name + '"}\n'
+            "*createmark surfaces 1 " + str_ids +
+            '\n*movemark surfaces 1 "' + name + '"\n'
+            '*endnotehistorystate {Moved surfaces into component "'
+            + name + '"}\n')
+        self.name = name
@@ -1,6 +1,7 @@
 """A script that contains the class that calculates the IDs that define con."""
 
 import numpy as np
+from node_registry import ID_DTYPE, id_table
 
 
 class ConnectionNodes:
@@ -9,73 +10,53 @@ class ConnectionNodes:
     def __init__(self, parameters, x_y_z, n_spars, n_stringers):
 
         # Initialize matrices for LE and TE storing
-        self.LE_IDs = np.zeros((3, parameters.N_ribs, 1))
-        self.TE_IDs_u = np.zeros((3, parameters.N_ribs, 1))
-        self.TE_IDs_l = np.zeros((3, parameters.N_ribs, 1))
+        self.LE_IDs = id_table((3, parameters.N_ribs, 1))
+        self.TE_IDs_u = id_table((3, parameters.N_ribs, 1))
+        self.TE_IDs_l = id_table((3, parameters.N_ribs, 1))
 
         # Define their values
-        self.calculate_le_te_ids(parameters)
+        self.calculate_le_te_ids(parameters, x_y_z.registry)
         # Put the other node ids in the curve arrays
         self.put_in_arrays(parameters, x_y_z, n_spars, n_stringers)
         # Insert the TE and LE ids to curve arrays
         self.insert_le_te(n_spars, n_stringers, parameters.N_ribs)
 
     def put_in_arrays(self, parameters, x_y_z, n_spars, n_stringers):
-        # Insert them to the arrays
-        self.Curve_IDs_Upper =\
-            np.zeros((3, parameters.N_ribs,
-                      3 * n_spars + n_stringers))
-        self.Curve_IDs_Lower =\
-            np.zeros((3, parameters.N_ribs,
-                      3 * n_spars + n_stringers))
-
-        for i in range(0, parameters.N_ribs):
-            for k in range(0, 3):
-                self.Curve_IDs_Upper[k, i, :] =\
-                    - np.sort(- np.concatenate((
-                        x_y_z.Spar_ID_Upper[k, i, :],
-                        x_y_z.Spar_Cap_ID_Upper_Left[k, i, :],
-                        x_y_z.Spar_Cap_ID_Upper_Right[k, i, :],
-                        x_y_z.stringer_id_upper[k, i, :]
-                        )))
-                self.Curve_IDs_Lower[k, i, :] =\
-                    np.sort(np.concatenate((
-                        x_y_z.Spar_ID_Lower[k, i, :],
-                        x_y_z.Spar_Cap_ID_Lower_Left[k, i, :],
-                        x_y_z.Spar_Cap_ID_Lower_Right[k, i, :],
-                        x_y_z.stringer_id_lower[k, i, :]
-                        )))
-        self.Curve_IDs_Upper = self.Curve_IDs_Upper.astype(int)
-        self.Curve_IDs_Lower = self.Curve_IDs_Lower.astype(int)
-
-    def calculate_le_te_ids(self, parameters):
-
-        for i in range(0, parameters.N_ribs):
-            for k in range(0, 3):
-                self.LE_IDs[k, i, 0] = ((2 * i + 1) * parameters.n) + parameters.N_ribs * 240 * k
-                self.TE_IDs_u[k, i, 0] = ((2 * i) * parameters.n + 1) + parameters.N_ribs * 240 * k
-                self.TE_IDs_l[k, i, 0] = ((2 * i + 2) * parameters.n) + parameters.N_ribs * 240 * k
+        # Insert them to the arrays, sorted along each rib for all ribs and
+        # layers at once (upper from TE to LE, lower from LE to TE)
+        self.Curve_IDs_Upper = - np.sort(- np.concatenate((
+            x_y_z.Spar_ID_Upper,
+            x_y_z.Spar_Cap_ID_Upper_Left,
+            x_y_z.Spar_Cap_ID_Upper_Right,
+            x_y_z.stringer_id_upper), axis=2), axis=2).astype(ID_DTYPE)
+        self.Curve_IDs_Lower = np.sort(np.concatenate((
+            x_y_z.Spar_ID_Lower,
+            x_y_z.Spar_Cap_ID_Lower_Left,
+            x_y_z.Spar_Cap_ID_Lower_Right,
+            x_y_z.stringer_id_lower), axis=2), axis=2).astype(ID_DTYPE)
+
+    def calculate_le_te_ids(self, parameters, registry):
+        # The LE is the last node of the upper curve and the TE the first
+        # node of the upper and the last of the lower, for all ribs and layers
+        k = np.arange(0, 3)[:, np.newaxis, np.newaxis]
+        i = np.arange(0, parameters.N_ribs)[np.newaxis, :, np.newaxis]
+        self.LE_IDs[:] = registry.id_of('rib', (k, i, parameters.n - 1))
+        self.TE_IDs_u[:] = registry.id_of('rib', (k, i, 0))
+        self.TE_IDs_l[:] = registry.id_of('rib', (k, i, 2 * parameters.n - 1))
 
     def insert_le_te(self, n_spars, n_stringers, n_ribs):
-        Curve_IDs_Upper_all =np.zeros((3, n_ribs, 3 * n_spars + n_stringers + 2))
-        Curve_IDs_Lower_all =np.zeros((3, n_ribs, 3 * n_spars + n_stringers + 2))
-
-        for k in range(0, 3):
-            Curve_IDs_Upper =\
-                np.insert(self.Curve_IDs_Upper[k, :, :],
-                          3 * n_spars + n_stringers, self.TE_IDs_u[k, :, 0], axis=1)
-            Curve_IDs_Upper =\
-                np.insert(Curve_IDs_Upper, 0, self.LE_IDs[k, :, 0], axis=1)
-
-            Curve_IDs_Lower =\
-                np.insert(self.Curve_IDs_Lower[k, :, :],
-                          3 * n_spars + n_stringers, self.TE_IDs_l[k, :, 0], axis=1)
-            Curve_IDs_Lower =\
-                np.insert(Curve_IDs_Lower, 0, self.LE_IDs[k, :, 0], axis=1)
-
-            Curve_IDs_Upper_all[k, :, :] = Curve_IDs_Upper
-            Curve_IDs_Lower_all[k, :, :] = Curve_IDs_Lower
-
-        # Make them integers
-        self.Curve_IDs_Upper = Curve_IDs_Upper_all.astype(int)
-        self.Curve_IDs_Lower = Curve_IDs_Lower_all.astype(int)
+        # The curves start from the LE and end at the TE
+        n_nodes = 3 * n_spars + n_stringers
+        Curve_IDs_Upper_all = np.empty((3, n_ribs, n_nodes + 2),
+                                       dtype=ID_DTYPE)
+        Curve_IDs_Lower_all = np.empty((3, n_ribs, n_nodes + 2),
+                                       dtype=ID_DTYPE)
+        Curve_IDs_Upper_all[:, :, 0:1] = self.LE_IDs
+        Curve_IDs_Upper_all[:, :, 1: n_nodes + 1] = self.Curve_IDs_Upper
+        Curve_IDs_Upper_all[:, :, n_nodes + 1:] = self.TE_IDs_u
+        Curve_IDs_Lower_all[:, :, 0:1] = self.LE_IDs
+        Curve_IDs_Lower_all[:, :, 1: n_nodes + 1] = self.Curve_IDs_Lower
+        Curve_IDs_Lower_all[:, :, n_nodes + 1:] = self.TE_IDs_l
+
+        self.Curve_IDs_Upper = Curve_IDs_Upper_all
+        self.Curve_IDs_Lower = Curve_IDs_Lower_all
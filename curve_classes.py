@@ -1,4 +1,6 @@
 import numpy as np
+from node_classes import format_id_lists, format_node_lists
+from node_registry import id_table
 
 
 class UpperRibCurve:
@@ -9,27 +11,37 @@ class UpperRibCurve:
         self.n_1 = n_1
         self.n_2 = n_2
         self.ids = ids
-        self.curves = np.zeros((self.n_1, 3 * self.n_2 + 1 + n_stringers))
+        self.curves = id_table((self.n_1, 3 * self.n_2 + 1 + n_stringers))
         self.curve_counter = curve_counter
         self.curves, self.curve_counter = self.write_tcl(n_stringers, file)
         self.sections_id = RibCurveIDs(self.curves, self.n_1, self.n_2,
                                        n_stringers_per_sect)
 
-    def list_creation(self, i, j):
-        my_list = list(range(self.ids[i, j + 1], self.ids[i, j] + 1))
-        return my_list
+    def node_runs(self):
+        """First and last node ID of each curve, in the form (rib, curve)."""
+        return self.ids[:, 1:], self.ids[:, :-1]
 
     def write_tcl(self, n_stringers, file):
-        for i in range(0, self.n_1):
-            for j in range(0, 3 * self.n_2 + 1 + n_stringers):
-                my_list = self.list_creation(i, j)
-                my_str = ' '.join(map(str, my_list))
-                cmd = "*createlist nodes 1 " + my_str
-                file.write(cmd)
-                file.write("\n*createvector 1 1 0 0\n*createvector 2 1 0 0"
-                           "\n*linecreatespline nodes 1 0 0 1 2\n")
-                self.curve_counter += 1
-                self.curves[i, j] = self.curve_counter
+        n_curves = 3 * self.n_2 + 1 + n_stringers
+        first, last = self.node_runs()
+        first = first[:, 0: n_curves].ravel()
+        lengths = last[:, 0: n_curves].ravel() - first + 1
+        self.curves[:, :] = np.arange(
+            self.curve_counter + 1,
+            self.curve_counter + self.n_1 * n_curves + 1).reshape(
+                self.n_1, n_curves)
+        self.curve_counter += self.n_1 * n_curves
+        if np.any(lengths <= 0) or first.min(initial=0) < 0:
+            raise ValueError('The rib node IDs must be non-negative and give '
+                             'at least one node per curve')
+        # All the node IDs of the curves, run after run
+        offsets = np.arange(0, lengths.sum()) - \
+            np.repeat(np.cumsum(lengths) - lengths, lengths)
+        file.write(format_node_lists(
+            np.repeat(first, lengths) + offsets, lengths,
+            "*createlist nodes 1 ",
+            "\n*createvector 1 1 0 0\n*createvector 2 1 0 0"
+            "\n*linecreatespline nodes 1 0 0 1 2\n"))
         return self.curves, self.curve_counter
 
 
@@ -39,10 +51,10 @@ class RibCurveIDs:
         # Store the id of each curve type
         self.LE = curves[:, 0]
         self.TE = curves[:, -1]
-        self.SC_L = np.zeros((n_1, n_2))
-        self.SC_R = np.zeros((n_1, n_2))
-        self.main_skin = np.zeros((n_1, n_2 - 1, n_stringers_per_sect + 1))
-        main_skin_sect = np.zeros((n_1, n_stringers_per_sect + 1))
+        self.SC_L = id_table((n_1, n_2))
+        self.SC_R = id_table((n_1, n_2))
+        self.main_skin = id_table((n_1, n_2 - 1, n_stringers_per_sect + 1))
+        main_skin_sect = id_table((n_1, n_stringers_per_sect + 1))
         for i in range(0, n_2):
             if i < n_2 - 1:
                 self.SC_L[:, i] = curves[:, (3 + n_stringers_per_sect) * i + 1]
@@ -58,9 +70,9 @@ class RibCurveIDs:
 
 
 class LowerRibCurve(UpperRibCurve):
-    def list_creation(self, i, j):
-        my_list = list(range(self.ids[i, j], self.ids[i, j + 1] + 1))
-        return my_list
+    def node_runs(self):
+        """First and last node ID of each curve, in the form (rib, curve)."""
+        return self.ids[:, :-1], self.ids[:, 1:]
 
 
 class LeadingTrailingEdgeCurves:
@@ -70,7 +82,7 @@ class LeadingTrailingEdgeCurves:
         self.n_1 = n_1
         self.n_2 = n_2
         self.ids = ids
-        self.curves = np.zeros((self.n_1 - 1, self.n_2))
+        self.curves = id_table((self.n_1 - 1, self.n_2))
         self.curve_counter = curve_counter
         self.curves, self.curve_counter = self.write_tcl(file)
 
@@ -79,14 +91,13 @@ class LeadingTrailingEdgeCurves:
         return my_list
 
     def write_tcl(self, file):
-        for i in range(0, self.n_1 - 1):
-            my_list = self.list_creation(i)
-            my_str = ' '.join(map(str, my_list))
-            cmd = "*createlist nodes 1 " + my_str
-            file.write(cmd)
-            file.write("\n*linecreatefromnodes 1 0 150 5 179\n")
-            self.curve_counter += 1
-            self.curves[i, 0] = self.curve_counter
+        text = format_id_lists(self.list_creation(np.arange(0, self.n_1 - 1)),
+                               (self.n_1 - 1,), "*createlist nodes 1 ",
+                               "\n*linecreatefromnodes 1 0 150 5 179\n")
+        file.write(text)
+        self.curves[:, 0] = np.arange(self.curve_counter + 1,
+                                      self.curve_counter + self.n_1)
+        self.curve_counter += self.n_1 - 1
         return self.curves, self.curve_counter
 
 
@@ -98,7 +109,7 @@ class MultipleCurves:
         self.n_2 = n_2
         self.ids_1 = ids_1
         self.ids_2 = ids_2
-        self.curves = np.zeros((self.n_1, self.n_2))
+        self.curves = id_table((self.n_1, self.n_2))
         self.curve_counter = curve_counter
         self.curves, self.curve_counter = self.write_tcl(file)
         self.reshape_curves()
@@ -108,21 +119,20 @@ class MultipleCurves:
         return my_list
 
     def write_tcl(self, file):
-        for i in range(0, self.n_1):
-            for j in range(0, self.n_2):
-                my_list = self.list_creation(i, j)
-                my_str = ' '.join(map(str, my_list))
-                cmd = "*createlist nodes 1 " + my_str
-                file.write(cmd)
-                file.write("\n*createvector 1 1 0 0\n*createvector 2 1 0 0"
-                           "\n*linecreatespline nodes 1 0 0 1 2\n")
-                self.curve_counter += 1
-                self.curves_indexing(i, j)
+        index = np.ix_(range(0, self.n_1), range(0, self.n_2))
+        text = format_id_lists(
+            self.list_creation(*index), (self.n_1, self.n_2),
+            "*createlist nodes 1 ",
+            "\n*createvector 1 1 0 0\n*createvector 2 1 0 0"
+            "\n*linecreatespline nodes 1 0 0 1 2\n")
+        file.write(text)
+        self.curves[:, :] = np.arange(
+            self.curve_counter + 1,
+            self.curve_counter + self.n_1 * self.n_2 + 1).reshape(
+                self.n_1, self.n_2)
+        self.curve_counter += self.n_1 * self.n_2
         return self.curves, self.curve_counter
 
-    def curves_indexing(self, i, j):
-        self.curves[i, j] = self.curve_counter
-
     def reshape_curves(self):
         pass
 
@@ -141,7 +151,7 @@ class StringersInRibsCurves(MultipleCurves):
         self.n_2 = n_2
         self.ids_1 = ids_1
         self.ids_2 = ids_2
-        self.curves = np.zeros((self.n_1, self.n_2))
+        self.curves = id_table((self.n_1, self.n_2))
         self.curve_counter = curve_counter
         self.curves, self.curve_counter = self.write_tcl(file)
         self.reshape_curves(n_spars, n_stringers_per_sect)
@@ -163,20 +173,21 @@ class CirclesForStringers:
         self.n_1 = n_1
         self.n_2 = n_2
         self.ids_1 = ids_1
-        self.curves = np.zeros((self.n_1, self.n_2))
+        self.curves = id_table((self.n_1, self.n_2))
         self.curve_counter = curve_counter
         self.curves, self.curve_counter = self.write_tcl(file)
         self.reshape_curves(n_spars, n_stringers_per_sect)
 
     def write_tcl(self, file):
+        commands = []
         for i in range(0, self.n_1):
             for j in range(0, self.n_2):
-                cmd = '*createlist nodes 1 %.0f' % (self.ids_1[i, j])
-                file.write(cmd)
-                file.write("\n*createvector 1 0 1 0\n"
-                           "*createcirclefromcenterradius 1 1 0.08 360 0\n")
+                commands.append('*createlist nodes 1 %.0f' % (self.ids_1[i, j]) +
+                                "\n*createvector 1 0 1 0\n"
+                                "*createcirclefromcenterradius 1 1 0.08 360 0\n")
                 self.curve_counter += 1
                 self.curves_indexing(i, j)
+        file.write(''.join(commands))
         return self.curves, self.curve_counter
 
     def curves_indexing(self, i, j):
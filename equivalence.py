@@ -12,5 +12,5 @@ class MeshEquivalence:
     def write_tcl(self, file, tolerance):
         names_1 = ' '.join(f'"{w}"' for w in self.groups)
 
-        file.write('*createmark components 1 ' + names_1)
-        file.write('\n*equivalence components 1 %.3f 1 0 0 0\n' % tolerance)
+        file.write('*createmark components 1 ' + names_1 +
+                   '\n*equivalence components 1 %.3f 1 0 0 0\n' % tolerance)
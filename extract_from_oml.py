@@ -33,11 +33,13 @@ from dataclasses import dataclass
 from spar_and_spar_caps_coords import SparsAndCapsCoords
 from store_spar_ids import SparsCapsIDs
 from connection_nodes import ConnectionNodes
+from node_registry import id_table
 import curve_classes
 import surface_classes
 import triple_surface_classes
 from run_arg import run_argument
 from delete_files import delete_files
+from read_data import write_layout
 import numpy as np
 
 # Set counter
@@ -185,7 +187,7 @@ class OmlSurfacesIDs:
 class IntersectionCurves:
 
     def __init__(self, construct_geometry, crm_surfaces, n_ribs, number_of_nodes):
-        self.curves = np.zeros((n_ribs, 2))
+        self.curves = id_table((n_ribs, 2))
         self.curves_from_intersections(construct_geometry, crm_surfaces, n_ribs)
         self.node_creation(n_ribs, number_of_nodes)
 
@@ -284,6 +286,8 @@ number_of_nodes = 50
 x = IntersectionCurves(construct_geometry, crm_surfaces,
                        Derived_Geometry.N_ribs, number_of_nodes)
 del_surfaces(construct_geometry)
+# Store the layout of the exported nodes for read_data.py
+write_layout(Derived_Geometry.N_ribs, number_of_nodes)
 
 with open('HM_Files/Construct_Nodes.tcl', 'a') as file:
     #  Tcl Script for nodal coordinates export
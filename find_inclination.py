@@ -6,81 +6,9 @@ Advices:
 the airfoil data
 
 """
-import math
 import numpy
-from scipy import interpolate
-from intersect import intersection
-from read_oml import read_oml
-
-
-class Airfoil:
-    """
-    Airfoil Class.
-
-    Defines a class that contains all the necessary instance attributes and a
-    method for reading, translating and rotating the airfoil's coordinates
-    """
-
-    def __init__(self, percent, x_origin, y_origin, z_origin, twist, chord):
-        self.percent = percent
-        self.X = x_origin
-        self.Y = y_origin
-        self.Z = z_origin
-        self.twist = twist
-        self.c = chord
-
-    def read_airfoil(self):
-        """
-        It's a method for the extraction of airfoil's data and transformation.
-
-        -------
-        x, y, z: The coordinates after rotation, translation and scaling
-        """
-        airfoil_path = 'Resources/uCRM_9/uCRM_9_Airfoil_Data/' \
-                       'uCRM-9_wr%.0f_profile.txt' % self.percent
-        with open(airfoil_path, 'r') as infile:
-            x_airfoil, z_airfoil = numpy.loadtxt(infile, unpack=True)
-        infile.close()
-        # Modify the TE of Lower curve to match the upper (sharp TE)
-        x_airfoil[-1] = x_airfoil[0]
-        z_airfoil[-1] = z_airfoil[0]
-        # Rotate the coordinates of airfoil
-        x = x_airfoil * math.cos(self.twist) - z_airfoil * math.sin(self.twist)
-        z = z_airfoil * math.cos(self.twist) + x_airfoil * math.sin(self.twist)
-        # Transform
-        x = x * self.c + self.X
-        y = self.Y
-        z = z * self.c + self.Z
-        return x, y, z
-
-
-class UCRM:
-    """
-    uCRM_9 Class.
-
-    It's a class that contains the coordinates of uCRM_9 wing.
-    """
-
-    def __init__(self):
-
-        # Read the coordinates
-        X, Y, Z, aoa, c = read_oml()
-        # Appending airfoil instances to airfoil_list
-        airfoil_list = []
-        self.x = numpy.zeros((240, 21))
-        self.y = numpy.zeros((240, 21))
-        self.z = numpy.zeros((240, 21))
-        self.chord = numpy.transpose(c)
-        self.twist = numpy.transpose(aoa)
-        # The percent of airfoils' Y coordinate
-        Y_percent = [0, 10, 15, 20, 25, 30, 35, 37, 40, 45, 50,
-                     55, 60, 65, 70, 75, 80, 85, 90, 95, 100]
-
-        for i in range(0, 21):
-            airfoil_list.append(Airfoil(Y_percent[i], X[i], Y[i], Z[i],
-                                        aoa[i], c[i]))
-            self.x[:, i], self.y[:, i], self.z[:, i] =\
-                airfoil_list[i].read_airfoil()
+from segment_intersection import first_intersection
+from wing_database import get_wing
 
 
 class RibsOrientation:
@@ -134,36 +62,25 @@ class RibsOrientation:
         Rib_line_Rotated_y : Array that contains the y coordinates of
         rotated rib line.
         """
-        Rib_line_Rotated_x = numpy.zeros((self.n, 2))
-        Rib_line_Rotated_y = numpy.zeros((self.n, 2))
         Rib_x = numpy.zeros((self.n, 2))
         Rib_y = numpy.zeros((self.n, 2))
 
-        # Rotate the rib lines to have the desired inclination
-        for i in range(0, self.n):
-            for j in range(0, 2):
-                # Move the center of rotation
-                Rib_line_x[i, j] = Rib_line_x[i, j] - self.Elastic_Axis_X[0, i]
-                Rib_line_y[i, j] = Rib_line_y[i, j] - self.Y_vector[i]
-                # Rotate x and y
-                Rib_line_Rotated_x[i, j] = Rib_line_x[i, j] * math.cos(Inclination[i])\
-                    - Rib_line_y[i, j] * math.sin(Inclination[i])\
-                    + self.Elastic_Axis_X[0, i]
-                Rib_line_Rotated_y[i, j] = Rib_line_y[i, j] * math.cos(Inclination[i])\
-                    + Rib_line_x[i, j] * math.sin(Inclination[i])\
-                    + self.Y_vector[i]
-                # Move the center of rotation
-                Rib_line_x[i, j] = Rib_line_x[i, j] + self.Elastic_Axis_X[0, i]
-                Rib_line_y[i, j] = Rib_line_y[i, j] + self.Y_vector[i]
+        # Rotate the rib lines to have the desired inclination around the
+        # elastic axis, for all ribs and endpoints at once
+        center_x = self.Elastic_Axis_X[0, :, numpy.newaxis]
+        center_y = self.Y_vector[:, numpy.newaxis]
+        cos = numpy.cos(Inclination).reshape(-1, 1)
+        sin = numpy.sin(Inclination).reshape(-1, 1)
+        delta_x = Rib_line_x - center_x
+        delta_y = Rib_line_y - center_y
+        Rib_line_Rotated_x = delta_x * cos - delta_y * sin + center_x
+        Rib_line_Rotated_y = delta_y * cos + delta_x * sin + center_y
 
         # Find the intersection with LE and TE
-        for i in range(0, self.n):
-            Rib_x[i, 0], Rib_y[i, 0] = intersection(LE_x, LE_y,
-                                                    Rib_line_Rotated_x[i, :],
-                                                    Rib_line_Rotated_y[i, :])
-            Rib_x[i, 1], Rib_y[i, 1] = intersection(TE_x, TE_y,
-                                                    Rib_line_Rotated_x[i, :],
-                                                    Rib_line_Rotated_y[i, :])
+        Rib_x[:, 0], Rib_y[:, 0], _ = first_intersection(
+            LE_x.ravel(), LE_y.ravel(), Rib_line_Rotated_x, Rib_line_Rotated_y)
+        Rib_x[:, 1], Rib_y[:, 1], _ = first_intersection(
+            TE_x.ravel(), TE_y.ravel(), Rib_line_Rotated_x, Rib_line_Rotated_y)
         return Rib_x, Rib_y, Rib_line_Rotated_x, Rib_line_Rotated_y
 
     def interpolate(self):
@@ -177,8 +94,8 @@ class RibsOrientation:
         Z : The matrix of z coordinates in the form (Airfoil Coord ID, Rib ID).
 
         """
-        # Call the UCRM class in order to get the wing data
-        Wing = UCRM()
+        # Get the shared UCRM database in order to get the wing data
+        Wing = get_wing()
 
         # Initialization of the desired arrays
         x_ = numpy.zeros((240, self.n))
@@ -249,16 +166,10 @@ class RibsOrientation:
             TE_y)
 
         # Calculate the id of the first rib that intersects with the kink's rib
-        for i in range(0, self.n):
-            int_x, int_y = intersection(Rib_x[i, :], Rib_y[i, :],
-                                        Rib_x[self.Rib_Sections_ID[1]
-                                              - 1, :],
-                                        Rib_y[self.Rib_Sections_ID[1]
-                                              - 1, :])
-            if len(int_x) == 0 and i > self.Rib_Sections_ID[1] - 1:
-                print(int_x, int_y)
-                idx = i
-                break
+        kink = self.Rib_Sections_ID[1] - 1
+        _, _, crosses = first_intersection(Rib_x, Rib_y, Rib_x[kink, :],
+                                           Rib_y[kink, :])
+        idx = kink + 1 + numpy.flatnonzero(~crosses[kink + 1:])[0]
 
         # Adjust the angle of the ribs between the first rib after the
         # intersection and the kink's rib
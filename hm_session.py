@@ -0,0 +1,258 @@
+"""
+A script that keeps one HyperMesh batch process alive for many .tcl scripts.
+
+Starting HyperMesh costs more than short scripts (e.g. the intersection pass
+of extract_from_oml.py) take to run. A BatchSession starts the batch process
+once with a small loader script, and then feeds it one program after another
+over its stdin. The loader evaluates each program when it reads its end
+marker and prints a completion marker with the Tcl return code, so the
+session knows when a job is done. The model is reset between the jobs.
+
+Any executable that speaks the same line protocol can stand in for
+HyperMesh:
+- the lines of a program, then the line '# __PYPDMW_END__ <job id>'
+- the answer is the output of the program, then the line
+'__PYPDMW_DONE__ <job id> <Tcl return code>'
+"""
+import itertools
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from run_arg import BatchJob, check_path
+
+END_MARKER = '# __PYPDMW_END__'
+DONE_MARKER = '__PYPDMW_DONE__'
+
+LOADER = '''fconfigure stdout -buffering line
+set pypdmw_program ""
+while {[gets stdin pypdmw_line] >= 0} {
+    if {[string match "%s *" $pypdmw_line]} {
+        set pypdmw_id [lindex $pypdmw_line 2]
+        set pypdmw_code [catch {uplevel #0 $pypdmw_program} pypdmw_result]
+        if {$pypdmw_code == 1} {
+            puts $pypdmw_result
+        }
+        puts "%s $pypdmw_id $pypdmw_code"
+        flush stdout
+        set pypdmw_program ""
+    } else {
+        append pypdmw_program $pypdmw_line "\\n"
+    }
+}
+''' % (END_MARKER, DONE_MARKER)
+
+
+def session_program(text):
+    """
+    It's a function that prepares a generated .tcl script for a session.
+
+    The '*quit' commands, which would end the batch process, are dropped.
+
+    Parameters
+    ----------
+    text : The text of the .tcl script.
+
+    Returns
+    -------
+    text : The text to be fed to the session.
+    """
+    lines = [line for line in text.splitlines()
+             if not line.lstrip().startswith('*quit')]
+    return '\n'.join(lines)
+
+
+class BatchSession:
+    """
+    A class that feeds .tcl programs to one persistent batch process.
+
+    The process is started on the first job and restarted after a timeout
+    or a crash.
+
+    Parameters
+    ----------
+    executable : The batch executable, as a path or as a list with a
+    command and its first arguments. The hm_batch of check_path is used if
+    None.
+    arguments : The arguments put before the loader script.
+    reset_command : The program run after each job to clear the model.
+    log_dir : Directory of the log files of the jobs.
+    cwd : Working directory of the batch process.
+    reset_timeout : Seconds to wait for the reset after each job. The
+    session is stopped if it expires, and restarted by the next job.
+    """
+
+    _ids = itertools.count()
+
+    def __init__(self, executable=None, arguments=('-tcl',),
+                 reset_command='*deletemodel', log_dir='HM_Files/logs',
+                 cwd=None, reset_timeout=60.0):
+        if executable is None:
+            executable = check_path()[2]
+        if isinstance(executable, (str, os.PathLike)):
+            executable = [executable]
+        self.command = [os.fspath(part) for part in executable]
+        self.arguments = list(arguments)
+        self.reset_command = reset_command
+        self.log_dir = log_dir
+        self.cwd = cwd
+        self.reset_timeout = reset_timeout
+        self.starts = 0
+        self._process = None
+        self._lines = None
+        self._loader_path = None
+
+    def start(self):
+        """Start the batch process with the loader script."""
+        if self._loader_path is None:
+            with tempfile.NamedTemporaryFile('w', suffix='.tcl',
+                                             delete=False) as loader:
+                loader.write(LOADER)
+            self._loader_path = loader.name
+        self._process = subprocess.Popen(
+            self.command + self.arguments + [self._loader_path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, cwd=self.cwd, text=True, bufsize=1)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_output,
+                         args=(self._process.stdout, self._lines),
+                         daemon=True).start()
+        self.starts += 1
+
+    @staticmethod
+    def _read_output(stream, lines):
+        for line in stream:
+            lines.put(line)
+        lines.put(None)
+
+    def alive(self):
+        """True if the batch process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def execute(self, program, timeout=None):
+        """
+        It's a method that runs one program and waits for its end marker.
+
+        Parameters
+        ----------
+        program : The Tcl text.
+        timeout : Seconds to wait for the marker (None for no limit).
+
+        Returns
+        -------
+        code : The Tcl return code (0 ok, 1 error, 2 return, ...), or None
+        if the process ended or timed out (it's then stopped).
+        output : The output of the program.
+        """
+        if not self.alive():
+            self.start()
+        job_id = '%d_%d' % (os.getpid(), next(self._ids))
+        self._process.stdin.write(program + '\n' + END_MARKER + ' ' +
+                                  job_id + '\n')
+        self._process.stdin.flush()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        output = []
+        while True:
+            wait = None if deadline is None else deadline - time.monotonic()
+            try:
+                if wait is not None and wait <= 0:
+                    raise queue.Empty
+                line = self._lines.get(timeout=wait)
+            except queue.Empty:
+                self.stop(kill=True)
+                return None, ''.join(output)
+            if line is None:
+                self.stop(kill=True)
+                return None, ''.join(output)
+            if line.startswith(DONE_MARKER + ' ' + job_id + ' '):
+                return int(line.split()[2]), ''.join(output)
+            output.append(line)
+
+    def run(self, tcl_script, name=None, timeout=None):
+        """
+        It's a method that runs a .tcl script and resets the model after it.
+
+        Parameters
+        ----------
+        tcl_script : Path of the .tcl script.
+        name : Name of the job and of its log file.
+        timeout : Timeout of the job in seconds (None for no limit).
+
+        Returns
+        -------
+        job : The BatchJob of the script (see run_job).
+        """
+        if name is None:
+            name = os.path.splitext(os.path.basename(tcl_script))[0]
+        return self.run_job(BatchJob(name, os.fspath(tcl_script),
+                                     os.path.join(self.log_dir, name + '.log'),
+                                     timeout))
+
+    def run_job(self, job):
+        """
+        Run a BatchJob in the session and record its outcome.
+
+        The returncode of the job is the Tcl return code of the script, and
+        the codes 0 (ok) and 2 (return) count as 'done'.
+        """
+        os.makedirs(os.path.dirname(job.log_path) or '.', exist_ok=True)
+        job.status = 'running'
+        tic = time.perf_counter()
+        output = ''
+        try:
+            with open(job.tcl_script, 'r') as infile:
+                program = session_program(infile.read())
+            code, output = self.execute(program, job.timeout)
+        except OSError as error:
+            self.stop(kill=True)
+            job.status = 'error'
+            job.error = str(error)
+        else:
+            job.returncode = code
+            if code is None:
+                job.status = 'timeout' if job.timeout is not None and \
+                    time.perf_counter() - tic >= job.timeout else 'failed'
+            else:
+                job.status = 'done' if code in (0, 2) else 'failed'
+        if self.alive() and self.reset_command:
+            code, reset_output = self.execute(self.reset_command,
+                                              self.reset_timeout)
+            output += reset_output
+            if code is None:
+                output += 'The reset timed out, the session was stopped\n'
+        job.wall_time = time.perf_counter() - tic
+        with open(job.log_path, 'w') as log:
+            log.write(output)
+        return job
+
+    def stop(self, kill=False):
+        """Stop the batch process (at once if kill is True)."""
+        if self._process is None:
+            return
+        if kill and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        elif self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+
+    def close(self):
+        """Stop the batch process and remove the loader script."""
+        self.stop()
+        if self._loader_path is not None:
+            os.remove(self._loader_path)
+            self._loader_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -31,6 +31,7 @@ from read_crm_data_incl import RibsInclined
 from spar_and_spar_caps_coords import SparsAndCapsCoords
 from store_spar_ids import SparsCapsIDs
 from connection_nodes import ConnectionNodes
+from node_classes import MultipleNodes
 from run_arg import run_argument
 from delete_files import delete_files
 
@@ -163,14 +164,8 @@ with open('Wing_Geometry_Generation.tcl', 'w') as f:
     f.write('*toleranceset 0.01\n')
 
     # Now print nodes in this format: *createnode x y z system id 0 0
-    for i in range(0, N_RIBS):
-        for j in range(0, 2 * NUMBER_OF_NODES):
-            # Free point
-            # f.write('*createpoint %.7f %.7f %.7f 0\n'
-            # % (X[i, j], Y[i, j], Z[i, j]))
-            # Nodes
-            f.write('*createnode %.7f %.7f %.7f 0 0 0\n'
-                    % (X[i, j], Y[i, j], Z[i, j]))
+    MultipleNodes(X[:, 0:2 * NUMBER_OF_NODES], Y[:, 0:2 * NUMBER_OF_NODES],
+                  Z[:, 0:2 * NUMBER_OF_NODES], 0, f)
 
     # Print upper rib curves
     Curve_U_Rib = np.zeros((N_RIBS, 3 * N_SPARS + 1))
@@ -32,6 +32,7 @@ from read_crm_data_incl import RibsInclined
 from spar_and_spar_caps_coords import SparsAndCapsCoords
 from store_spar_ids import SparsCapsIDs
 from connection_nodes import ConnectionNodes
+import node_classes
 import curve_classes
 import surface_classes
 from run_arg import run_argument
@@ -139,14 +140,9 @@ with open('Wing_Geometry_Generation.tcl', 'w') as file:
     file.write('*toleranceset 0.01\n')
 
     # Now print nodes in this format: *createnode x y z system id 0 0
-    for i in range(0, N_RIBS):
-        for j in range(0, 2 * NUMBER_OF_NODES):
-            # Free point
-            # f.write('*createpoint %.7f %.7f %.7f 0\n'
-            #         % (X[i, j], Y[i, j], Z[i, j]))
-            # Nodes
-            file.write('*createnode %.7f %.7f %.7f 0 0 0\n'
-                       % (X[i, j], Y[i, j], Z[i, j]))
+    node_classes.MultipleNodes(X[:, 0:2 * NUMBER_OF_NODES],
+                               Y[:, 0:2 * NUMBER_OF_NODES],
+                               Z[:, 0:2 * NUMBER_OF_NODES], 0, file)
 file.close()
 
 
@@ -29,9 +29,9 @@ class GenerateMesh:
             '*createmark surfaces 1 ' + str_ids +
             '\n*interactiveremeshsurf 1 %.3f 1 1 2 1 1\n' %
             (component.mesh_size))
-        for i in range(0, len(component.surfaces)):
-            cmd = MeshPropertiesAssignment(i, self.mesh_properties)
-            file.write(cmd)
+        file.write(''.join(
+            MeshPropertiesAssignment(i, self.mesh_properties)
+            for i in range(0, len(component.surfaces))))
         file.write(
             '*storemeshtodatabase 1\n'
             '*ameshclearsurface\n'
@@ -51,9 +51,9 @@ class GenerateGlobalMesh:
             '*startnotehistorystate {Automesh surfaces}\n'
             '*createmark surfaces 1 ' + str_ids +
             '\n*interactiveremeshsurf 1 0.2 1 1 2 1 1\n')
-        for i in range(0, len(surfaces)):
-            cmd = MeshPropertiesAssignment(i, self.mesh_properties)
-            file.write(cmd)
+        file.write(''.join(
+            MeshPropertiesAssignment(i, self.mesh_properties)
+            for i in range(0, len(surfaces))))
         file.write(
             '*storemeshtodatabase 1\n'
             '*ameshclearsurface\n'
@@ -66,8 +66,8 @@ class GenerateWithAutomesh:
 
     def write_tcl(self, surfaces, file):
         str_ids = ' '.join(map(str, surfaces))
-        file.write('*createmark surfaces 1 ' + str_ids)
-        file.write('\n*defaultremeshsurf 1 0.1 1 1 2 1 1 1 1 0 0 0 0\n')
+        file.write('*createmark surfaces 1 ' + str_ids +
+                   '\n*defaultremeshsurf 1 0.1 1 1 2 1 1 1 1 0 0 0 0\n')
 
 
 def MeshPropertiesAssignment(index, mesh_properties):
@@ -0,0 +1,176 @@
+"""
+A script that contains the classes and helpers that write the nodes.
+
+MultipleNodes writes the *createnode commands of whole coordinate arrays, with
+the IDs of a family of the node registry. The helpers write lists of entity
+IDs ('*createlist nodes 1 ...' and the like) for many lists at once, with
+numpy instead of a Python loop over the IDs.
+"""
+import numpy as np
+
+
+# The text of all 4-digit groups, '0000' to '9999', one uint32 per group
+DIGIT_GROUPS = np.array([list(b'%04d' % i) for i in range(0, 10000)],
+                        dtype=np.uint8).view(np.uint32).ravel()
+
+
+def integer_digits(values):
+    """
+    It's a function that formats non-negative integers as '%d' with numpy.
+
+    Parameters
+    ----------
+    values : 1D array of non-negative integers.
+
+    Returns
+    -------
+    chars : uint8 array (n, width) of the right-aligned text of each value.
+    lengths : The length of the text of each value.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    n_digits = np.ones(len(values), dtype=np.int64)
+    power = 10
+    while power <= values.max(initial=0):
+        n_digits += values >= power
+        power *= 10
+    n_groups = (int(n_digits.max(initial=1)) - 1) // 4 + 1
+    groups = np.empty((len(values), n_groups), dtype=np.uint32)
+    rest = values.copy()
+    for group in range(0, n_groups):
+        groups[:, n_groups - 1 - group] = DIGIT_GROUPS[rest % 10000]
+        rest //= 10000
+    return groups.view(np.uint8), n_digits
+
+
+def format_node_lists(values, lengths, prefix, suffix, point_zero=None):
+    """
+    It's a function that writes several lists of node IDs at once.
+
+    The text of each list is prefix + ' '.join(map(str, ids)) + suffix, where
+    ids are the next lengths[i] values. Every value gets one fixed-width row
+    with room for the prefix, its digits and the suffix, and a mask of the
+    used characters turns the rows into the final text.
+
+    Parameters
+    ----------
+    values : 1D array of the non-negative IDs of all lists.
+    lengths : The number of IDs of each list (at least one).
+    prefix, suffix : The text before and after each list.
+    point_zero : Optional boolean array, True for the values to be written
+    with a '.0' (like str of a float ID).
+
+    Returns
+    -------
+    text : The text of all lists.
+    """
+    chars, n_chars = integer_digits(values)
+    ends = np.cumsum(lengths)
+    first = np.zeros(len(values), dtype=bool)
+    last = np.zeros(len(values), dtype=bool)
+    first[ends - lengths] = True
+    last[ends - 1] = True
+    prefix = np.frombuffer(prefix.encode('ascii'), dtype=np.uint8)
+    suffix = np.frombuffer(suffix.encode('ascii'), dtype=np.uint8)
+    width = chars.shape[1]
+    start = len(prefix)
+    end = start + width
+    tail = 0 if point_zero is None else 2
+
+    rows = np.empty((len(values), end + tail + len(suffix)), dtype=np.uint8)
+    rows[:, :start] = prefix
+    rows[:, start: end] = chars
+    rows[:, end: end + tail] = np.frombuffer(b'.0'[:tail], dtype=np.uint8)
+    rows[:, end + tail:] = suffix
+    rows[~last, end + tail] = ord(' ')
+    used = np.zeros(rows.shape, dtype=bool)
+    used[first, :start] = True
+    used[:, start: end] = np.arange(width) >= width - n_chars[:, np.newaxis]
+    if tail:
+        used[:, end: end + tail] = np.asarray(point_zero)[:, np.newaxis]
+    used[:, end + tail] = True
+    used[last, end + tail:] = True
+    return rows[used].tobytes().decode('ascii')
+
+
+def format_id_lists(columns, shape, prefix, suffix):
+    """
+    It's a function that writes lists of entity IDs gathered column by column.
+
+    The text of each list is prefix + ' '.join(map(str, ids)) + suffix, where
+    ids are the values of all columns at one index, like in the loops of
+    list_creation. Integer columns are written as '%d' and float columns as
+    str of a float ID ('12.0').
+
+    Parameters
+    ----------
+    columns : Sequence of arrays with the given shape, one per ID of a list.
+    shape : The shape of the lists.
+    prefix, suffix : The text before and after each list.
+
+    Returns
+    -------
+    text : The text of all lists.
+
+    A ValueError is raised if the ID tables are invalid (wrong shape,
+    negative, non-integer or non-finite IDs, or no columns).
+    """
+    columns = [np.asarray(column) for column in columns]
+    size = int(np.prod(shape))
+    if not columns:
+        raise ValueError('No ID columns to write')
+    for column in columns:
+        if column.shape != tuple(shape):
+            raise ValueError('An ID table has the shape %s instead of %s'
+                             % (column.shape, tuple(shape)))
+        if column.dtype.kind == 'f':
+            if not np.all(np.isfinite(column)) or \
+                    np.any(np.signbit(column)) or \
+                    np.any(column >= 1e16) or \
+                    np.any(column != np.floor(column)):
+                raise ValueError('An ID table has negative, non-integer or '
+                                 'non-finite IDs')
+        elif column.dtype.kind not in 'iu' or np.any(column < 0):
+            raise ValueError('An ID table has negative or non-integer IDs')
+    values = np.stack([column.astype(np.int64).ravel()
+                       for column in columns], axis=1).ravel()
+    point_zero = np.tile([column.dtype.kind == 'f' for column in columns],
+                         size)
+    return format_node_lists(values, np.full(size, len(columns)), prefix,
+                             suffix, point_zero)
+
+
+class MultipleNodes:
+    """
+    A class that writes the *createnode commands of whole coordinate arrays.
+
+    The nodes are created in the C order of the arrays and take the IDs of a
+    family of the node registry (allocated here if it doesn't exist yet).
+    self.ids has the shape of the arrays and holds the HyperMesh ID of each
+    node, and self.node_counter is the last of them.
+    """
+
+    template = '*createnode %.7f %.7f %.7f 0 0 0\n'
+
+    def __init__(self, coord_x, coord_y, coord_z, registry, name, file):
+        coord_x = np.asarray(coord_x, dtype=float)
+        self.shape = coord_x.shape
+        self.coords = np.stack((coord_x.ravel(),
+                                np.asarray(coord_y, dtype=float).ravel(),
+                                np.asarray(coord_z, dtype=float).ravel()),
+                               axis=1)
+        if name not in registry.shapes:
+            registry.allocate(name, self.shape)
+        elif registry.shapes[name] != self.shape:
+            raise ValueError('The node family %s has the shape %s, not %s'
+                             % (name, registry.shapes[name], self.shape))
+        self.ids = registry.ids(name)
+        self.node_counter = registry.start(name) + len(self.coords)
+        self.write_tcl(file)
+
+    def write_tcl(self, file, chunk=100000):
+        # One '%' of the template repeated over a chunk of nodes, instead of
+        # one per line
+        for start in range(0, len(self.coords), chunk):
+            values = self.coords[start: start + chunk]
+            file.write((self.template * len(values))
+                       % tuple(values.ravel().tolist()))
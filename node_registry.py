@@ -0,0 +1,90 @@
+"""
+A script that contains the registry of the HyperMesh node IDs.
+
+The nodes are created family by family (rib curves, stringer flanges, ...)
+and each family takes a contiguous block of IDs, in the C order of its array.
+The registry keeps these blocks, so that the ID of any node is found from its
+index in the family with array arithmetic only.
+
+All the entity ID tables (nodes, curves, surfaces) use ID_DTYPE, the integer
+type of the HyperMesh IDs.
+"""
+import numpy as np
+
+
+ID_DTYPE = np.int32
+
+
+def id_table(shape):
+    """An ID table of the given shape, filled with zeros."""
+    return np.zeros(shape, dtype=ID_DTYPE)
+
+
+class NodeRegistry:
+    """
+    A class that assigns contiguous ID blocks to the node families.
+
+    Parameters
+    ----------
+    node_counter : The last ID used before the first block.
+    """
+
+    def __init__(self, node_counter=0):
+        self.node_counter = node_counter
+        self.names = []
+        self.starts = []
+        self.shapes = {}
+
+    def allocate(self, name, shape):
+        """
+        It's a method that reserves the next block of IDs for a family.
+
+        Parameters
+        ----------
+        name : The name of the family.
+        shape : The shape of the family's array.
+
+        Returns
+        -------
+        ids : Array with the given shape and the ID of each node.
+        """
+        if name in self.shapes:
+            raise ValueError('The node family ' + name + ' already exists')
+        shape = tuple(int(length) for length in np.atleast_1d(shape))
+        if self.node_counter + int(np.prod(shape)) > np.iinfo(ID_DTYPE).max:
+            raise OverflowError('The node family %s of shape %s takes IDs '
+                                'above the largest HyperMesh ID %d'
+                                % (name, shape, np.iinfo(ID_DTYPE).max))
+        self.names.append(name)
+        self.starts.append(self.node_counter)
+        self.shapes[name] = shape
+        self.node_counter += int(np.prod(shape))
+        return self.ids(name)
+
+    def start(self, name):
+        """The last ID before the block of a family."""
+        return self.starts[self.names.index(name)]
+
+    def ids(self, name):
+        """Array with the ID of each node of a family."""
+        shape = self.shapes[name]
+        return np.arange(self.start(name) + 1,
+                         self.start(name) + int(np.prod(shape)) + 1,
+                         dtype=ID_DTYPE).reshape(shape)
+
+    def id_of(self, name, index):
+        """
+        It's a method that returns the IDs of the nodes at the given indices.
+
+        Parameters
+        ----------
+        name : The name of the family.
+        index : Tuple of (broadcastable) index arrays, one per dimension.
+
+        Returns
+        -------
+        ids : The ID of each node.
+        """
+        return (self.start(name) + 1 + np.ravel_multi_index(
+            tuple(np.asarray(i) for i in index), self.shapes[name])
+                ).astype(ID_DTYPE)
@@ -0,0 +1,175 @@
+"""
+A script that generates the .tcl scripts of many wing designs in parallel.
+
+Each design is a wing_parameters.Parameters (and optionally a
+mesh_parameters.Parameters) and gets its own output directory, with its .tcl
+script and the path of its HyperMesh model. The designs are generated by a
+pool of worker processes, one design at a time per worker, and the wall time
+of each design is reported.
+
+With a cache directory, the workers share a stage_cache.StageCache, so the
+stages that don't depend on the varied fields are computed once for the whole
+sweep (and for later sweeps with the same cache).
+
+Advices:
+- Run it from the pyPDMW directory, like main_oop_with_stringers.py, because
+the workers read the uCRM-9 data from the relative 'Resources/' paths
+- On Windows the sweep must be started under if __name__ == '__main__'
+"""
+import itertools
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, replace
+from main_oop_with_stringers import default_parameters, generate_wing
+from stage_cache import StageCache
+from stage_graph import StageGraph
+
+REPORT_NAME = 'sweep_report.json'
+
+
+@dataclass
+class DesignResult:
+    """
+    It's a dataclass for the outcome of the generation of one design.
+    """
+    name: str
+    directory: str
+    tcl_path: str
+    wall_time: float  # Seconds spent by the worker on the design
+    bytes: int = 0
+    commands: int = 0
+    reused_stages: int = 0  # Stages found in the cache
+    error: str = None  # The traceback if the generation failed
+
+
+def parameter_grid(base, **values):
+    """
+    It's a function that builds the designs of a full factorial grid.
+
+    Parameters
+    ----------
+    base : The Parameters of the reference design.
+    values : For each field to be swept, the list of its values, e.g.
+    n_spars=[2, 3, 4].
+
+    Returns
+    -------
+    designs : List with a copy of base for every combination of the values.
+    """
+    names = list(values)
+    return [replace(base, **dict(zip(names, combination)))
+            for combination in itertools.product(*values.values())]
+
+
+def run_design(name, parameters, mesh_parameters, directory, cache_dir=None,
+               bypass_cache=False):
+    """
+    It's a function that generates one design in its own directory.
+
+    Any error of the generation is caught and stored in the result, so that
+    one bad design doesn't stop the sweep.
+
+    Parameters
+    ----------
+    cache_dir : Directory of the stage cache (no cache if None).
+    bypass_cache : If True, the cache is neither read nor written.
+
+    Returns
+    -------
+    result : DesignResult of the design.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tcl_path = os.path.join(directory, 'Wing_Geometry_Generation.tcl')
+    hm_path = os.path.abspath(os.path.join(directory, 'wing.hm'))
+    hm_path = hm_path.replace(os.sep, '/')
+    cache = None if cache_dir is None else StageCache(cache_dir,
+                                                      bypass=bypass_cache)
+    graph = StageGraph(cache, reuse=False)
+    tic = time.perf_counter()
+    try:
+        stats = generate_wing(parameters, mesh_parameters, tcl_path=tcl_path,
+                              hm_path=hm_path, plot=False, graph=graph)
+    except Exception:
+        return DesignResult(name, directory, tcl_path,
+                            time.perf_counter() - tic,
+                            error=traceback.format_exc())
+    return DesignResult(name, directory, tcl_path, time.perf_counter() - tic,
+                        stats['bytes'], stats['commands'],
+                        len(graph.reused()))
+
+
+def run_sweep(designs, output_dir='Sweep', max_workers=None, cache_dir=None,
+              bypass_cache=False):
+    """
+    It's a function that generates all the designs with a process pool.
+
+    Parameters
+    ----------
+    designs : List of Parameters, or of (Parameters, mesh Parameters)
+    tuples. The mesh parameters of default_parameters are used if not given.
+    output_dir : The directory of the designs' directories and the report.
+    max_workers : Number of worker processes (all cores if None).
+    cache_dir : Directory of the stage cache (no cache if None).
+    bypass_cache : If True, the cache is neither read nor written.
+
+    Returns
+    -------
+    results : List with the DesignResult of each design, in the given order.
+    """
+    default_mesh = default_parameters()[1]
+    jobs = []
+    for i, design in enumerate(designs):
+        if isinstance(design, tuple):
+            parameters, mesh_parameters = design
+        else:
+            parameters, mesh_parameters = design, default_mesh
+        name = 'design_%04d' % i
+        jobs.append((name, parameters, mesh_parameters,
+                     os.path.join(output_dir, name)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    tic = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_design, *job, cache_dir,
+                                   bypass_cache) for job in jobs]
+        results = [future.result() for future in futures]
+    wall_time = time.perf_counter() - tic
+
+    write_report(results, jobs, wall_time,
+                 os.path.join(output_dir, REPORT_NAME))
+    return results
+
+
+def write_report(results, jobs, wall_time, path):
+    """
+    It's a function that writes the .json report of a sweep.
+
+    The report has the total wall time of the sweep and, for each design, its
+    parameters, wall time, output size and error (if any).
+    """
+    report = {'wall_time': wall_time,
+              'n_designs': len(results),
+              'n_failed': sum(result.error is not None for result in results),
+              'designs': []}
+    for result, (_, parameters, mesh_parameters, _) in zip(results, jobs):
+        entry = asdict(result)
+        entry['parameters'] = asdict(parameters)
+        entry['mesh_parameters'] = asdict(mesh_parameters)
+        report['designs'].append(entry)
+    with open(path, 'w') as outfile:
+        json.dump(report, outfile, indent=1)
+
+
+if __name__ == '__main__':
+    # Example: all the combinations of 2-4 spars and 4 or 8 stringers per
+    # spar section around the reference design
+    base_parameters = default_parameters()[0]
+    Designs = parameter_grid(base_parameters, n_spars=[2, 3, 4],
+                             n_stringers=[4, 8])
+    Results = run_sweep(Designs, cache_dir='Stage_Cache')
+    for Result in Results:
+        status = 'failed' if Result.error else '%d bytes' % Result.bytes
+        print(f"{Result.name}: {Result.wall_time:0.2f} s, {status}")
@@ -6,81 +6,9 @@ Advices:
 the airfoil data
 
 """
-import math
 import numpy
-from scipy import interpolate
-from intersect import intersection
-from read_oml import read_oml
-
-
-class Airfoil:
-    """
-    Airfoil Class.
-
-    Defines a class that contains all the necessary instance attributes and a
-    method for reading, translating and rotating the airfoil's coordinates
-    """
-
-    def __init__(self, percent, x_origin, y_origin, z_origin, twist, chord):
-        self.percent = percent
-        self.X = x_origin
-        self.Y = y_origin
-        self.Z = z_origin
-        self.twist = twist
-        self.c = chord
-
-    def read_airfoil(self):
-        """
-        It's a method for the extraction of airfoil's data and transformation.
-
-        -------
-        x, y, z: The coordinates after rotation, translation and scaling
-        """
-        airfoil_path = 'Resources/uCRM_9/uCRM_9_Airfoil_Data/' \
-                       'uCRM-9_wr%.0f_profile.txt' % self.percent
-        with open(airfoil_path, 'r') as infile:
-            x_airfoil, z_airfoil = numpy.loadtxt(infile, unpack=True)
-        infile.close()
-        # Modify the TE of Lower curve to match the upper (sharp TE)
-        x_airfoil[-1] = x_airfoil[0]
-        z_airfoil[-1] = z_airfoil[0]
-        # Rotate the coordinates of airfoil
-        x = x_airfoil * math.cos(self.twist) - z_airfoil * math.sin(self.twist)
-        z = z_airfoil * math.cos(self.twist) + x_airfoil * math.sin(self.twist)
-        # Transform
-        x = x * self.c + self.X
-        y = self.Y
-        z = z * self.c + self.Z
-        return x, y, z
-
-
-class UCRM:
-    """
-    uCRM_9 Class.
-
-    It's a class that contains the coordinates of uCRM_9 wing.
-    """
-
-    def __init__(self):
-
-        # Read the coordinates
-        x, y, z, aoa, c = read_oml()
-        # Appending airfoil instances to airfoil_list
-        airfoil_list = []
-        self.x = numpy.zeros((240, 21))
-        self.y = numpy.zeros((240, 21))
-        self.z = numpy.zeros((240, 21))
-        self.chord = numpy.transpose(c)
-        self.twist = numpy.transpose(aoa)
-        # The percent of airfoils' Y coordinate
-        y_percent = [0, 10, 15, 20, 25, 30, 35, 37, 40, 45, 50,
-                     55, 60, 65, 70, 75, 80, 85, 90, 95, 100]
-
-        for i in range(0, 21):
-            airfoil_list.append(Airfoil(y_percent[i], x[i], y[i], z[i],
-                                        aoa[i], c[i]))
-            self.x[:, i], self.y[:, i], self.z[:, i] =\
-                airfoil_list[i].read_airfoil()
+from segment_intersection import first_intersection
+from wing_database import get_wing, get_surface
 
 
 class RibsInclined:
@@ -134,52 +62,27 @@ class RibsInclined:
         rib_line_rotated_y : Array that contains the y coordinates of
         rotated rib line.
         """
-        rib_line_rotated_x = numpy.zeros((3, self.n, 2))
-        rib_line_rotated_y = numpy.zeros((3, self.n, 2))
         rib_x = numpy.zeros((3, self.n, 2))
         rib_y = numpy.zeros((3, self.n, 2))
 
-        # Rotate the rib lines to have the desired inclination
-        for i in range(0, self.n):
-            for j in range(0, 2):
-                for k in range(0, 3):
-                    # Move the center of rotation
-                    rib_line_x[k, i, j] = rib_line_x[k, i, j] - self.Elastic_Axis_X[k, i]
-                    rib_line_y[k, i, j] = rib_line_y[k, i, j] - self.Y_vector[i, k]
-                    # Rotate x and y
-                    rib_line_rotated_x[k, i, j] = rib_line_x[k, i, j] * math.cos(inclination[k, i])\
-                        - rib_line_y[k, i, j] * math.sin(inclination[k, i])\
-                        + self.Elastic_Axis_X[k, i]
-                    rib_line_rotated_y[k, i, j] = rib_line_y[k, i, j] * math.cos(inclination[k, i])\
-                        + rib_line_x[k, i, j] * math.sin(inclination[k, i])\
-                        + self.Y_vector[i, k]
-                    # Move the center of rotation
-                    rib_line_x[k, i, j] = rib_line_x[k, i, j] + self.Elastic_Axis_X[k, i]
-                    rib_line_y[k, i, j] = rib_line_y[k, i, j] + self.Y_vector[i, k]
+        # Rotate the rib lines to have the desired inclination around the
+        # elastic axis, for all layers, ribs and endpoints at once
+        center_x = self.Elastic_Axis_X[:, :, numpy.newaxis]
+        center_y = self.Y_vector.T[:, :, numpy.newaxis]
+        cos = numpy.cos(inclination)[:, :, numpy.newaxis]
+        sin = numpy.sin(inclination)[:, :, numpy.newaxis]
+        delta_x = rib_line_x - center_x
+        delta_y = rib_line_y - center_y
+        rib_line_rotated_x = delta_x * cos - delta_y * sin + center_x
+        rib_line_rotated_y = delta_y * cos + delta_x * sin + center_y
 
         # Find the intersection with LE and TE
-        for i in range(0, self.n):
-            for k in range(0, 3):
-                x_0, y_0 =\
-                    intersection(le_x, le_y,
-                                 rib_line_rotated_x[k, i, :],
-                                 rib_line_rotated_y[k, i, :])
-                x_1, y_1 =\
-                    intersection(te_x, te_y,
-                                 rib_line_rotated_x[k, i, :],
-                                 rib_line_rotated_y[k, i, :])
-
-                if len(x_0) == 0:
-                    pass
-                else:
-                    rib_x[k, i, 0] = x_0[0]
-                    rib_y[k, i, 0] = y_0[0]
-
-                if len(x_1) == 0:
-                    pass
-                else:
-                    rib_x[k, i, 1] = x_1[0]
-                    rib_y[k, i, 1] = y_1[0]
+        rib_x[:, :, 0], rib_y[:, :, 0], _ =\
+            first_intersection(le_x.ravel(), le_y.ravel(),
+                               rib_line_rotated_x, rib_line_rotated_y)
+        rib_x[:, :, 1], rib_y[:, :, 1], _ =\
+            first_intersection(te_x.ravel(), te_y.ravel(),
+                               rib_line_rotated_x, rib_line_rotated_y)
 
         return rib_x, rib_y, rib_line_rotated_x, rib_line_rotated_y
 
@@ -194,31 +97,27 @@ class RibsInclined:
         Z : The matrix of z coordinates in the form (Airfoil Coord ID, Rib ID).
 
         """
-        # Call the U-CRM class in order to get the wing data
-        wing = UCRM()
+        # Get the shared U-CRM database in order to get the wing data
+        wing = get_wing()
 
         # Initialization of the desired arrays
-        x_ = numpy.zeros((3, 240, self.n))
-        z_ = numpy.zeros((3, 240, self.n))
         y_ = numpy.zeros((3, 240, self.n))
 
         for i in range(0, 3):
             y_[i, :, :] = numpy.ones((240, self.n)) * self.Y_vector[:, i]
 
-        self.chords = numpy.zeros((3, self.n))
-        self.twist = numpy.zeros((3, self.n))
-
         # Linear interpolation to find the coordinates at the desired Y
-        for j in range(0, self.n):
-            self.chords[:, j] = numpy.interp(y_[:, 0, j], wing.y[0, :],
-                                             wing.chord[0, :])
-            self.twist[:, j] = numpy.interp(y_[:, 0, j], wing.y[0, :],
-                                            wing.twist[0, :])
-            for i in range(0, 240):
-                x_[:, i, j] = numpy.interp(self.Y_vector[j, :], wing.y[i, :],
-                                           wing.x[i, :])
-                z_[:, i, j] = numpy.interp(x_[:, i, j], wing.x[i, :],
-                                           wing.z[i, :])
+        self.chords = numpy.interp(self.Y_vector.T, wing.y[0, :],
+                                   wing.chord[0, :])
+        self.twist = numpy.interp(self.Y_vector.T, wing.y[0, :],
+                                  wing.twist[0, :])
+        # All airfoil points (rows) at all layers and ribs at once
+        y_request = numpy.broadcast_to(self.Y_vector.T.ravel(),
+                                       (240, 3 * self.n))
+        x_rows = interp_rows(y_request, wing.y, wing.x)
+        z_rows = interp_rows(x_rows, wing.x, wing.z)
+        x_ = x_rows.reshape(240, 3, self.n).transpose(1, 0, 2)
+        z_ = z_rows.reshape(240, 3, self.n).transpose(1, 0, 2)
 
         # Calculation of the elastic axis as
         # the mean between front and rear wing box
@@ -273,15 +172,12 @@ class RibsInclined:
             te_y)
 
         # Calculate the id of the first rib that intersects with the kink's rib
-        idx = 0
-        for i in range(0, self.n):
-            int_x, int_y =\
-                intersection(rib_x[0, i, :], rib_y[0, i, :],
-                             rib_x[0, self.Rib_Sections_ID[1] - 1, :],
-                             rib_y[0, self.Rib_Sections_ID[1] - 1, :])
-            if len(int_x) == 0 and i > self.Rib_Sections_ID[1] - 1:
-                idx = i
-                break
+        kink = self.Rib_Sections_ID[1] - 1
+        _, _, crosses = first_intersection(rib_x[0, :, :], rib_y[0, :, :],
+                                           rib_x[0, kink, :],
+                                           rib_y[0, kink, :])
+        after_kink = numpy.flatnonzero(~crosses[kink + 1:])
+        idx = kink + 1 + after_kink[0] if len(after_kink) > 0 else 0
 
         # Adjust the angle of the ribs between the first rib after the
         # intersection and the kink's rib
@@ -307,49 +203,30 @@ class RibsInclined:
         y_new_all = numpy.zeros((3, self.n, n_points))
 
         # Use linear interpolation to find the coordinates of the lin-spaced x
+        # (on the line between the two ends of each rib, from the end with
+        # the smaller x, like scipy's interp1d)
         for i in range(0, self.n):
             for k in range(0, 3):
-                x = [rib_x[k, i, 0], rib_x[k, i, 1]]
-                y = [rib_y[k, i, 0], rib_y[k, i, 1]]
-                f = interpolate.interp1d(x, y)
+                lo, hi = (0, 1) if rib_x[k, i, 0] <= rib_x[k, i, 1] else (1, 0)
+                slope = (rib_y[k, i, hi] - rib_y[k, i, lo]) / \
+                    (rib_x[k, i, hi] - rib_x[k, i, lo])
                 x_new_all[k, i, :] = numpy.linspace(rib_x[k, i, 0], rib_x[k, i, 1], n_points)
-                y_new_all[k, i, :] = f(x_new_all[k, i, :])
+                y_new_all[k, i, :] = slope * (x_new_all[k, i, :] -
+                                              rib_x[k, i, lo]) + rib_y[k, i, lo]
 
         self.X = numpy.zeros((3, self.n, 2 * n_points))
         self.Y = numpy.zeros((3, self.n, 2 * n_points))
         self.Z = numpy.zeros((3, self.n, 2 * n_points))
         w_list = [0, parameters.rib_stiffeners_width, - parameters.rib_stiffeners_width]
+        # Find the Z of the upper and lower surface for all layers at once on
+        # the surface of the database (no griddata per design)
+        Z_upper_all, Z_lower_all = get_surface().evaluate(x_new_all,
+                                                          y_new_all)
         for k in range(0, 3):
-            # Now concatenate the values
-            x_new = numpy.concatenate(x_new_all[k, :, :])
-            y_new = numpy.concatenate(y_new_all[k, :, :])
-            # Concatenate the known coordinates in upper and lower arrays
-            x_upper = numpy.concatenate(x_[k, 0:119, :])
-            y_upper = numpy.concatenate(y_[k, 0:119, :])
-            z_upper = numpy.concatenate(z_[k, 0:119, :])
-            x_lower = numpy.concatenate(x_[k, 120:239, :])
-            y_lower = numpy.concatenate(y_[k, 120:239, :])
-            z_lower = numpy.concatenate(z_[k, 120:239, :])
-
-            # Define the request array that contains the XY pairs where we want
-            # to find the Z
-            request = numpy.transpose(numpy.array([x_new, y_new]))
-
-            # Find the desired data for the upper points with griddata function
-            points_upper = numpy.transpose(numpy.array([x_upper, y_upper]))
-            values_upper = numpy.transpose(z_upper)
-            Z_upper = interpolate.griddata(points_upper, values_upper, request)
-
-            # Find the desired data for the lower points with griddata function
-            points_lower = numpy.transpose(numpy.array([x_lower, y_lower]))
-            values_lower = numpy.transpose(z_lower)
-            Z_lower = interpolate.griddata(points_lower, values_lower, request)
-
-            # Now reshape to an array form
-            X = x_new.reshape(len(self.Y_vector), n_points)
-            Y = y_new.reshape(len(self.Y_vector), n_points)
-            Z_upper = Z_upper.reshape(len(self.Y_vector), n_points)
-            Z_lower = Z_lower.reshape(len(self.Y_vector), n_points)
+            X = x_new_all[k, :, :]
+            Y = y_new_all[k, :, :]
+            Z_upper = Z_upper_all[k, :, :]
+            Z_lower = Z_lower_all[k, :, :]
 
             # Construct the total arrays
             self.X[k, :, :] = numpy.concatenate((numpy.flip(X, 1), X), axis=1)
@@ -370,3 +247,50 @@ class RibsInclined:
 
             # Sharp TE
             self.Z[k, :, 0] = self.Z[k, :, -1]
+
+
+def interp_rows(x, xp, fp):
+    """
+    It's a function that does numpy.interp for many rows at once.
+
+    Each row of x is interpolated on the same row of xp and fp. The segment
+    search, the formula and the edge cases follow numpy.interp, so that the
+    results are identical to a loop of numpy.interp calls.
+
+    Parameters
+    ----------
+    x : Array (n_rows, n) of the desired points.
+    xp : Array (n_rows, m) of the sample points (increasing in each row).
+    fp : Array (n_rows, m) of the sample values.
+
+    Returns
+    -------
+    f : Array (n_rows, n) of the interpolated values.
+    """
+    x = numpy.asarray(x, dtype=float)
+    xp = numpy.asarray(xp, dtype=float)
+    fp = numpy.asarray(fp, dtype=float)
+    m = xp.shape[1]
+
+    # Index of the segment that contains each point: xp[j] <= x < xp[j + 1]
+    j = numpy.count_nonzero(xp[:, numpy.newaxis, :] <= x[:, :, numpy.newaxis],
+                            axis=2) - 1
+    segment = numpy.clip(j, 0, m - 2)
+    x_0 = numpy.take_along_axis(xp, segment, axis=1)
+    x_1 = numpy.take_along_axis(xp, segment + 1, axis=1)
+    f_0 = numpy.take_along_axis(fp, segment, axis=1)
+    f_1 = numpy.take_along_axis(fp, segment + 1, axis=1)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        slope = (f_1 - f_0) / (x_1 - x_0)
+        f = slope * (x - x_0) + f_0
+        # If we get nan in one direction, try the other
+        nan = numpy.isnan(f)
+        f[nan] = slope[nan] * (x[nan] - x_1[nan]) + f_1[nan]
+        flat = nan & numpy.isnan(f) & (f_0 == f_1)
+        f[flat] = f_0[flat]
+    f = numpy.where(x == x_0, f_0, f)
+    f = numpy.where(j == m - 1, fp[:, -1:], f)
+    f = numpy.where(x < xp[:, :1], fp[:, :1], f)
+    f = numpy.where(x > xp[:, -1:], fp[:, -1:], f)
+    return f
@@ -1,35 +1,145 @@
-"""It's a script that reads the ribs coordinates and stores them in a class."""
+"""
+It's a script that reads the ribs coordinates and stores them in a class.
+
+The HyperMesh export ('HM_Files/nodes.txt') is parsed once and stored in a
+binary sidecar ('nodes.txt.npy') with its shape metadata ('nodes.txt.json').
+Later reads memory-map the sidecar, as long as the export is unchanged. If
+the sidecar can't be written (e.g. a read-only directory), the parsed nodes
+are returned directly.
+"""
+import json
+import os
 import numpy as np
+from airfoil_cache import write_atomic
+
+NODES_PATH = 'HM_Files/nodes.txt'
+# Written by extract_from_oml.py along with the export script
+LAYOUT_PATH = 'HM_Files/nodes_layout.json'
+
+
+def write_layout(n_ribs, n_points, layout_path=LAYOUT_PATH):
+    """
+    It's a function that stores the layout of the nodes that will be exported.
+
+    Parameters
+    ----------
+    n_ribs : Number of ribs.
+    n_points : Number of nodes per rib curve (upper or lower).
+    layout_path : Path of the layout file.
+
+    Returns
+    -------
+    None.
+    """
+    with open(layout_path, 'w') as outfile:
+        json.dump({'n_ribs': int(n_ribs), 'n_points': int(n_points)}, outfile)
+
+
+def source_stamp(path):
+    """Size and mtime of the export, used to detect stale sidecars."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def parse_nodes(path, n_ribs=None, n_points=None, layout_path=LAYOUT_PATH):
+    """
+    It's a function that parses the export and sorts it in Selig format.
+
+    Parameters
+    ----------
+    path : Path of the export with "id x y z" in each line.
+    n_ribs, n_points : The layout of the nodes. If not given, they are read
+    from the layout file. If only n_points is known, n_ribs is inferred from
+    the number of nodes.
+    layout_path : Path of the layout file.
+
+    Returns
+    -------
+    coords : Array in the form (id/x/y/z, Rib ID, Point ID).
+    """
+    if n_points is None and os.path.isfile(layout_path):
+        with open(layout_path, 'r') as infile:
+            layout = json.load(infile)
+        n_ribs = layout['n_ribs']
+        n_points = layout['n_points']
+    if n_points is None:
+        raise ValueError('The number of points per rib curve of ' + path +
+                         ' is unknown. Give n_points or a layout file.')
+
+    # Parsing in C, without a Python loop over the lines
+    coords = np.fromfile(path, sep=' ').reshape(-1, 4).T
+    n_nodes = coords.shape[1]
+    if n_ribs is None:
+        n_ribs = n_nodes // (2 * n_points)
+    if n_nodes != 2 * n_ribs * n_points:
+        raise ValueError('%s has %d nodes, expected %d ribs x 2 x %d points'
+                         % (path, n_nodes, n_ribs, n_points))
+
+    coords = coords[:, np.argsort(coords[0, :])]
+    coords = coords.reshape(4, n_ribs, 2 * n_points)
+    upper_coords = coords[:, :, 0:n_points]
+    lower_coords = coords[:, :, n_points: 2 * n_points]
+    # minus because of selig format
+    j = np.argsort(-upper_coords[1, :, :], axis=1)
+    upper_coords = np.take_along_axis(upper_coords, j[np.newaxis], axis=2)
+    j = np.argsort(lower_coords[1, :, :], axis=1)
+    lower_coords = np.take_along_axis(lower_coords, j[np.newaxis], axis=2)
+    return np.concatenate((upper_coords, lower_coords), axis=2)
+
+
+def read_nodes(path=NODES_PATH, n_ribs=None, n_points=None,
+               layout_path=LAYOUT_PATH):
+    """
+    It's a function that returns the sorted nodes of the export.
+
+    On the first read (or when the export has changed) the text is parsed and
+    the binary sidecar is written. Afterwards the sidecar is memory-mapped.
+    If the sidecar can't be written, the parsed array is returned.
+
+    Parameters
+    ----------
+    See parse_nodes.
+
+    Returns
+    -------
+    coords : Read-only array in the form (id/x/y/z, Rib ID, Point ID).
+    """
+    sidecar_path = path + '.npy'
+    meta_path = path + '.json'
+    stamp = source_stamp(path)
+    try:
+        with open(meta_path, 'r') as infile:
+            meta = json.load(infile)
+        if meta['source'] == stamp and \
+                n_ribs in (None, meta['n_ribs']) and \
+                n_points in (None, meta['n_points']):
+            return np.load(sidecar_path, mmap_mode='r')
+    except (OSError, ValueError, KeyError):  # Missing or broken sidecar
+        pass
+
+    coords = parse_nodes(path, n_ribs, n_points, layout_path)
+    meta = {'source': stamp,
+            'n_ribs': coords.shape[1],
+            'n_points': coords.shape[2] // 2}
+    try:
+        write_atomic(sidecar_path, lambda outfile: np.save(outfile, coords))
+        write_atomic(meta_path,
+                     lambda outfile: outfile.write(json.dumps(meta).encode()))
+    except OSError:
+        coords.flags.writeable = False
+        return coords
+    return np.load(sidecar_path, mmap_mode='r')
 
 
 class Coordinates:
     """A class that reads, sorts and creates a list of Node objects."""
 
-    def __init__(self):
-        with open('HM_Files/nodes.txt', 'r') as infile:
-            node_id, coord_x, coord_y, coord_z = np.loadtxt(infile,
-                                                            unpack=True)
-        infile.close()
-        node_id = node_id.astype('int')
-        coords = np.array([node_id, coord_x, coord_y, coord_z])
-        i = np.argsort(node_id)
-        coords = coords[:, i]
-        n_ribs = 20
-        n_points = 50
-        coords = coords[..., np.newaxis]
-        coords = coords.reshape(4, n_ribs, 2 * n_points)
-        self.upper_coords = coords[:, :, 0:n_points]
-        self.lower_coords = coords[:, :, n_points: 2 * n_points]
-        for i in range(0, n_ribs):
-            # minus because of selig format
-            j = np.argsort(-self.upper_coords[1, i, :])
-            self.upper_coords[:, i, :] = self.upper_coords[:, i, j]
-            j = np.argsort(self.lower_coords[1, i, :])
-            self.lower_coords[:, i, :] = self.lower_coords[:, i, j]
-
-        self.xyz = np.concatenate((self.upper_coords,
-                                   self.lower_coords),
-                                  axis=2)
+    def __init__(self, path=NODES_PATH, n_ribs=None, n_points=None):
+        self.xyz = read_nodes(path, n_ribs, n_points)
+        self.n_ribs = self.xyz.shape[1]
+        self.n_points = self.xyz.shape[2] // 2
+        self.upper_coords = self.xyz[:, :, 0:self.n_points]
+        self.lower_coords = self.xyz[:, :, self.n_points: 2 * self.n_points]
         self.x = self.xyz[1, :, :]
         # self.nodes = {}
         # for i in range(0, len(node_id)):
@@ -48,6 +158,7 @@ class Coordinates:
             self.coord_z = coord_z
 
 
-rib_coords = Coordinates()
+if __name__ == '__main__':
+    rib_coords = Coordinates()
 
 # x = (rib_coords.Nodes[1].x)
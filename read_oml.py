@@ -6,21 +6,49 @@ Advices:
 the coordinates that I have calculate for the leading and trailing edge
 
 """
-import math
+from dataclasses import dataclass
+from functools import lru_cache
 import numpy
 
+OML_PATH = 'Resources/uCRM_9/uCRM_9_Coord.txt'  # Must have!!!!
 
-def read_oml():
+
+@dataclass(frozen=True)
+class OmlData:
     """
-    It's a function for retrieving the origins, calculation of chord and twist.
+    It's a read-only dataclass for the OML data of the 21 stations.
 
-    -------
-    x_origin, y_origin, z_origin: The origin of each airfoil's LE
-    twist: The twist of each airfoil
-    chord: The chord of each airfoil
+    All arrays are flagged as non-writeable, since a single instance is
+    shared by every consumer in the process.
     """
-    airfoil_path = 'Resources/uCRM_9/uCRM_9_Coord.txt'  # Must have!!!!
+    x_origin: numpy.ndarray  # (21, 1)
+    y_origin: numpy.ndarray  # (21, )
+    z_origin: numpy.ndarray  # (21, 1)
+    twist: numpy.ndarray  # (21, 1)
+    chord: numpy.ndarray  # (21, 1)
+    leading_edge: numpy.ndarray  # (21, 3) XYZ of the LE polyline
+    trailing_edge: numpy.ndarray  # (21, 3) XYZ of the TE polyline
 
+    def __post_init__(self):
+        for value in vars(self).values():
+            value.flags.writeable = False
+
+
+@lru_cache(maxsize=None)
+def oml_data(airfoil_path=OML_PATH):
+    """
+    It's a function that reads the LE/TE coordinates and derives the OML.
+
+    The result is cached per path; use oml_data.cache_clear() to reload.
+
+    Parameters
+    ----------
+    airfoil_path : Path of the file with the LE and TE coordinates.
+
+    Returns
+    -------
+    oml : The shared OmlData instance.
+    """
     with open(airfoil_path, 'r') as infile:
         _, id_x, id_y, id_z = numpy.loadtxt(infile, unpack=True)
 
@@ -28,24 +56,33 @@ def read_oml():
     front = numpy.dstack((id_x, id_y, id_z)).squeeze()[0:21, :]
     rear = numpy.dstack((id_x, id_y, id_z)).squeeze()[21:42, :]
 
-    # Initialization of matrices
-    chord = numpy.zeros((21, 1))
-    twist = numpy.zeros((21, 1))
-    xinit = numpy.zeros((21, 1))
-    zinit = numpy.zeros((21, 1))
-
-    for i in range(0, 21):
-        chord[i, 0] = math.sqrt((front[i, 2] - rear[i, 2]) ** 2 +
-                                (front[i, 0] - rear[i, 0]) ** 2)
-        twist[i, 0] = - math.atan(-(front[i, 2] - rear[i, 2]) /
-                                  (front[i, 0] - rear[i, 0]))
-        d = chord[i, 0] * 0.25 * math.cos(twist[i, 0])
-        dx = chord[i, 0] * 0.25 - d
-        dz = chord[i, 0] * 0.25 * math.sin(twist[i, 0])
-        zinit[i, 0] = front[i, 2] - dz
-        xinit[i, 0] = front[i, 0] + dx
-
-    z_origin = zinit - zinit[0]
-    x_origin = xinit - xinit[0]
-    y_origin = front[:, 1]
-    return x_origin, y_origin, z_origin, twist, chord
+    delta_x = front[:, 0:1] - rear[:, 0:1]
+    delta_z = front[:, 2:3] - rear[:, 2:3]
+    chord = numpy.sqrt(delta_z ** 2 + delta_x ** 2)
+    twist = - numpy.arctan(- delta_z / delta_x)
+    d = chord * 0.25 * numpy.cos(twist)
+    dx = chord * 0.25 - d
+    dz = chord * 0.25 * numpy.sin(twist)
+    zinit = front[:, 2:3] - dz
+    xinit = front[:, 0:1] + dx
+
+    return OmlData(x_origin=xinit - xinit[0],
+                   y_origin=front[:, 1].copy(),
+                   z_origin=zinit - zinit[0],
+                   twist=twist,
+                   chord=chord,
+                   leading_edge=front.copy(),
+                   trailing_edge=rear.copy())
+
+
+def read_oml():
+    """
+    It's a function for retrieving the origins, calculation of chord and twist.
+
+    -------
+    x_origin, y_origin, z_origin: The origin of each airfoil's LE
+    twist: The twist of each airfoil
+    chord: The chord of each airfoil
+    """
+    oml = oml_data()
+    return oml.x_origin, oml.y_origin, oml.z_origin, oml.twist, oml.chord
@@ -1,7 +1,21 @@
-"""Script that feeds the desired .tcl file to HyperMesh."""
+"""
+Script that feeds the desired .tcl files to HyperMesh.
 
-import subprocess
+The scripts are run by a pool of headless HyperMesh batch processes
+(BatchJobPool): each job gets one of N slots, an optional timeout and a log
+file with its output, and its exit status is kept. The executable and its
+arguments can be changed, e.g. to a local stand-in that just reads the
+script. With persistent=True every slot keeps one batch process alive for
+all its jobs (see hm_session.BatchSession).
+"""
+
+import os
 import os.path
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 
 def check_path():
@@ -31,21 +45,178 @@ def check_path():
     return path, hm_loc, hm_batch
 
 
-def run_argument(tcl_script):
+@dataclass
+class BatchJob:
+    """
+    It's a dataclass for one .tcl script run by the BatchJobPool.
+
+    status is 'pending', 'running', 'done' (exit code 0), 'failed' (other
+    exit code), 'timeout' (killed after the timeout) or 'error' (the
+    executable couldn't be started).
+    """
+    name: str
+    tcl_script: str
+    log_path: str
+    timeout: float = None
+    status: str = 'pending'
+    returncode: int = None
+    wall_time: float = 0.0
+    error: str = None
+
+
+class BatchJobPool:
     """
-    It's a function that constructs the argument to run the tcl script.
+    A class that runs .tcl scripts with concurrent HyperMesh batch processes.
 
     Parameters
     ----------
-    tcl_script : TYPE
-        DESCRIPTION.
+    executable : The batch executable, as a path or as a list with a
+    command and its first arguments. The hm_batch of check_path is used if
+    None.
+    n_slots : Number of scripts run at the same time.
+    timeout : Default timeout of each job in seconds (None for no limit).
+    log_dir : Directory of the log files of the jobs.
+    arguments : The arguments put before each script.
+    cwd : Working directory of the batch processes.
+    persistent : If True, each slot feeds its jobs to one persistent batch
+    session instead of starting a process per job.
+    reset_command : The command that clears the model between the jobs of
+    a persistent session.
+    """
+
+    def __init__(self, executable=None, n_slots=1, timeout=None,
+                 log_dir='HM_Files/logs', arguments=('-tcl',), cwd=None,
+                 persistent=False, reset_command='*deletemodel'):
+        if executable is None:
+            executable = check_path()[2]
+        if isinstance(executable, (str, os.PathLike)):
+            executable = [executable]
+        self.command = [os.fspath(part) for part in executable]
+        self.arguments = list(arguments)
+        self.n_slots = n_slots
+        self.timeout = timeout
+        self.log_dir = log_dir
+        self.cwd = cwd
+        self.persistent = persistent
+        self.reset_command = reset_command
+        self.jobs = []
+        self.sessions = []
+        self._slot = threading.local()
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=n_slots)
+
+    def submit(self, tcl_script, name=None, timeout=None):
+        """
+        It's a method that queues a script and returns its job.
+
+        Parameters
+        ----------
+        tcl_script : Path of the .tcl script.
+        name : Name of the job and of its log file (from the script and the
+        job number if None).
+        timeout : Timeout of this job (the pool's timeout if None).
+
+        Returns
+        -------
+        job : The BatchJob, updated when the job runs.
+        """
+        if name is None:
+            name = '%03d_' % len(self.jobs) + \
+                os.path.splitext(os.path.basename(tcl_script))[0]
+        job = BatchJob(name, os.fspath(tcl_script),
+                       os.path.join(self.log_dir, name + '.log'),
+                       self.timeout if timeout is None else timeout)
+        self.jobs.append(job)
+        self._futures.append(self._executor.submit(self.run_job, job))
+        return job
+
+    def run_job(self, job):
+        """Run one job in the calling thread and record its outcome."""
+        if self.persistent:
+            return self.session().run_job(job)
+        os.makedirs(self.log_dir, exist_ok=True)
+        job.status = 'running'
+        tic = time.perf_counter()
+        with open(job.log_path, 'wb') as log:
+            try:
+                completed = subprocess.run(
+                    self.command + self.arguments + [job.tcl_script],
+                    stdin=subprocess.DEVNULL, stdout=log,
+                    stderr=subprocess.STDOUT, cwd=self.cwd,
+                    timeout=job.timeout, check=False)
+            except subprocess.TimeoutExpired:
+                job.status = 'timeout'
+            except OSError as error:
+                job.status = 'error'
+                job.error = str(error)
+            else:
+                job.returncode = completed.returncode
+                job.status = 'done' if completed.returncode == 0 \
+                    else 'failed'
+        job.wall_time = time.perf_counter() - tic
+        return job
+
+    def session(self):
+        """The persistent batch session of the calling slot."""
+        session = getattr(self._slot, 'session', None)
+        if session is None:
+            from hm_session import BatchSession
+            session = BatchSession(self.command, self.arguments,
+                                   self.reset_command, self.log_dir, self.cwd)
+            self._slot.session = session
+            self.sessions.append(session)
+        return session
+
+    def run(self, tcl_scripts):
+        """Queue several scripts and wait for all of them (see submit)."""
+        jobs = [self.submit(tcl_script) for tcl_script in tcl_scripts]
+        self.wait()
+        return jobs
+
+    def wait(self):
+        """Wait until all the queued jobs have finished."""
+        for future in self._futures:
+            future.result()
+        return self.jobs
+
+    def close(self):
+        """Wait for the queued jobs and stop the slots and their sessions."""
+        self._executor.shutdown(wait=True)
+        for session in self.sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def run_argument(tcl_script, gui=False, timeout=None):
+    """
+    It's a function that runs the tcl script in HyperMesh.
+
+    The script is run by a headless batch process, or by the GUI (which
+    blocks until it's closed) if gui is True.
+
+    Parameters
+    ----------
+    tcl_script : Path of the .tcl script, relative to the path of
+    check_path.
+    gui : If True, the script is opened in the HyperMesh GUI.
+    timeout : Timeout of the batch run in seconds (None for no limit).
 
     Returns
     -------
-    None.
+    job : The BatchJob of the batch run (None with the GUI).
 
     """
     path, hm_loc, hm_batch = check_path()
     tcl_script = path + tcl_script
-    arg = hm_loc + " -tcl " + tcl_script
-    subprocess.call(arg)
+    if gui:
+        arg = hm_loc + " -tcl " + tcl_script
+        subprocess.call(arg)
+        return None
+    with BatchJobPool(hm_batch, timeout=timeout) as pool:
+        job = pool.submit(tcl_script)
+    return job
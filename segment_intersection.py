@@ -0,0 +1,185 @@
+"""
+A script that contains the batched intersection of polylines.
+
+It replaces the intersect.intersection calls of one pair of curves at a time.
+Whole arrays of polylines (spars, stringers, LE/TE) and rib lines are given at
+once and the crossings of every pair are found with array operations only.
+The crossings are computed like intersect.intersection: the segments whose
+bounding boxes overlap are the candidates, and for each candidate the same 4x4
+system is solved (in one batched numpy.linalg.solve call), so the results are
+identical.
+"""
+import numpy as np
+
+# The number of pairs of segments tested at once by intersections
+CHUNK_PAIRS = 1 << 18
+
+
+def gather_rows(values, shape, index):
+    """
+    It's a function that gathers the curves of some batch items.
+
+    Parameters
+    ----------
+    values : Array (..., points) whose batch dimensions broadcast to shape.
+    shape : The broadcast batch shape.
+    index : Tuple of index arrays (one per dimension of shape) of the items.
+
+    Returns
+    -------
+    rows : Array (items, points). Only the gathered rows are copied, the
+    rows of a curve shared by all items are a broadcast view.
+    """
+    offset = len(shape) - (values.ndim - 1)
+    rows = values[tuple(index[offset + d] if length > 1 else 0
+                        for d, length in enumerate(values.shape[:-1]))]
+    return np.broadcast_to(rows, (len(index[0]) if index else 1,
+                                  values.shape[-1]))
+
+
+def solve_systems(matrices, vectors):
+    """
+    It's a function that solves many 4x4 systems like intersect does.
+
+    Singular systems get an infinite solution instead of an error.
+
+    Parameters
+    ----------
+    matrices : Array (n, 4, 4).
+    vectors : Array (n, 4).
+
+    Returns
+    -------
+    t : Array (n, 4) of the solutions.
+    """
+    try:
+        return np.linalg.solve(matrices, vectors[:, :, np.newaxis])[:, :, 0]
+    except np.linalg.LinAlgError:
+        t = np.empty(vectors.shape)
+        for i in range(0, len(vectors)):
+            try:
+                t[i] = np.linalg.solve(matrices[i], vectors[i])
+            except np.linalg.LinAlgError:
+                t[i] = np.inf
+        return t
+
+
+def intersections(x1, y1, x2, y2, chunk_pairs=CHUNK_PAIRS):
+    """
+    It's a function that finds all the crossings of pairs of polylines.
+
+    The batch dimensions (all but the last) of the inputs are broadcast, so
+    e.g. all spars can be intersected with all ribs in a single call. The
+    batch is processed in chunks of about chunk_pairs pairs of segments, so
+    the memory used doesn't grow with the size of the batch.
+
+    Parameters
+    ----------
+    x1, y1 : Arrays (..., m) of the points of the first polylines.
+    x2, y2 : Arrays (..., p) of the points of the second polylines.
+    chunk_pairs : The number of pairs of segments tested at once.
+
+    Returns
+    -------
+    batch : Flat index (in the broadcast batch shape) of each crossing.
+    x, y : The coordinates of each crossing. The crossings of each pair are
+    in the order of intersect.intersection.
+    shape : The broadcast batch shape.
+    """
+    x1, y1, x2, y2 = (np.asarray(value, dtype=float)
+                      for value in (x1, y1, x2, y2))
+    shape = np.broadcast_shapes(x1.shape[:-1], y1.shape[:-1],
+                                x2.shape[:-1], y2.shape[:-1])
+    size = int(np.prod(shape))
+    pairs = max(1, (x1.shape[-1] - 1) * (x2.shape[-1] - 1))
+    chunk = max(1, chunk_pairs // pairs)
+
+    batch, x, y = [], [], []
+    for start in range(0, size, chunk):
+        index = np.unravel_index(np.arange(start, min(size, start + chunk)),
+                                 shape) if shape else ()
+        chunk_batch, chunk_x, chunk_y = crossings(
+            *(gather_rows(value, shape, index)
+              for value in (x1, y1, x2, y2)))
+        batch.append(chunk_batch + start)
+        x.append(chunk_x)
+        y.append(chunk_y)
+    if not batch:
+        return np.zeros(0, dtype=np.intp), np.zeros(0), np.zeros(0), shape
+    return np.concatenate(batch), np.concatenate(x), np.concatenate(y), shape
+
+
+def crossings(x1, y1, x2, y2):
+    """
+    It's a function that finds the crossings of pairs of polylines.
+
+    Parameters
+    ----------
+    x1, y1 : Arrays (batch, m) of the points of the first polylines.
+    x2, y2 : Arrays (batch, p) of the points of the second polylines.
+
+    Returns
+    -------
+    batch : Index of the pair of each crossing.
+    x, y : The coordinates of each crossing.
+    """
+    # Candidates: the segments with overlapping bounding boxes
+    def bounds(values):
+        start, end = values[:, :-1], values[:, 1:]
+        return np.minimum(start, end), np.maximum(start, end)
+
+    x1_min, x1_max = bounds(x1)
+    y1_min, y1_max = bounds(y1)
+    x2_min, x2_max = bounds(x2)
+    y2_min, y2_max = bounds(y2)
+    overlap = \
+        (x1_min[:, :, np.newaxis] <= x2_max[:, np.newaxis, :]) & \
+        (x1_max[:, :, np.newaxis] >= x2_min[:, np.newaxis, :]) & \
+        (y1_min[:, :, np.newaxis] <= y2_max[:, np.newaxis, :]) & \
+        (y1_max[:, :, np.newaxis] >= y2_min[:, np.newaxis, :])
+    batch, i, j = np.nonzero(overlap)
+
+    # The system of intersect.intersection for each candidate
+    n = len(batch)
+    matrices = np.zeros((n, 4, 4))
+    matrices[:, 0:2, 2] = -1
+    matrices[:, 2:4, 3] = -1
+    matrices[:, 0, 0] = x1[batch, i + 1] - x1[batch, i]
+    matrices[:, 2, 0] = y1[batch, i + 1] - y1[batch, i]
+    matrices[:, 1, 1] = x2[batch, j + 1] - x2[batch, j]
+    matrices[:, 3, 1] = y2[batch, j + 1] - y2[batch, j]
+    vectors = np.stack((-x1[batch, i], -x2[batch, j],
+                        -y1[batch, i], -y2[batch, j]), axis=1)
+    t = solve_systems(matrices, vectors)
+
+    in_range = (t[:, 0] >= 0) & (t[:, 1] >= 0) & \
+        (t[:, 0] <= 1) & (t[:, 1] <= 1)
+    return batch[in_range], t[in_range, 2], t[in_range, 3]
+
+
+def first_intersection(x1, y1, x2, y2):
+    """
+    It's a function that finds the first crossing of pairs of polylines.
+
+    It's the batched version of taking [0] of intersect.intersection.
+
+    Parameters
+    ----------
+    See intersections.
+
+    Returns
+    -------
+    x, y : Arrays (broadcast batch shape) of the first crossing of each
+    pair, or 0 if there's none.
+    found : Boolean array, True where the pair crosses.
+    """
+    batch, x_int, y_int, shape = intersections(x1, y1, x2, y2)
+    batch, first = np.unique(batch, return_index=True)
+    size = int(np.prod(shape))
+    x = np.zeros(size)
+    y = np.zeros(size)
+    found = np.zeros(size, dtype=bool)
+    x[batch] = x_int[first]
+    y[batch] = y_int[first]
+    found[batch] = True
+    return x.reshape(shape), y.reshape(shape), found.reshape(shape)
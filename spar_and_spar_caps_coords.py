@@ -1,7 +1,7 @@
 """A script that contains the class that calculates the spars coordinates."""
 
 import numpy as np
-from intersect import intersection
+from segment_intersection import first_intersection
 
 
 # Too much repeated code. Needs improvement
@@ -24,19 +24,11 @@ class SparsAndCapsCoords:
         # Initialize the Spars Nodes array
         spars_nodes_x = np.zeros((3, parameters.n_spars, derived_geometry.N_ribs))
         spars_nodes_y = np.zeros((3, parameters.n_spars, derived_geometry.N_ribs))
-        spars_nodes_x_incl = np.zeros((3, parameters.n_spars,
-                                       derived_geometry.N_ribs))
-        spars_nodes_y_incl = np.zeros((3, parameters.n_spars,
-                                       derived_geometry.N_ribs))
         # Initialize the stringers nodes array
         stringers_nodes_x = np.zeros((3, n_stringers_total,
                                       derived_geometry.N_ribs))
         stringers_nodes_y = np.zeros((3, n_stringers_total,
                                       derived_geometry.N_ribs))
-        stringers_nodes_x_incl = np.zeros((3, n_stringers_total,
-                                           derived_geometry.N_ribs))
-        stringers_nodes_y_incl = np.zeros((3, n_stringers_total,
-                                           derived_geometry.N_ribs))
         # Translate the spars
         translation(parameters.n_spars, derived_geometry, wing, fuselage_rib,
                     spars_position, spars_nodes_x, spars_nodes_y)
@@ -46,14 +38,6 @@ class SparsAndCapsCoords:
         # Initialize the spar caps arrays
         spar_caps_xl = np.zeros((3, parameters.n_spars, derived_geometry.N_ribs))
         spar_caps_xr = np.zeros((3, parameters.n_spars, derived_geometry.N_ribs))
-        spar_caps_xl_incl = np.zeros((3, parameters.n_spars,
-                                      derived_geometry.N_ribs))
-        spar_caps_xr_incl = np.zeros((3, parameters.n_spars,
-                                      derived_geometry.N_ribs))
-        spar_caps_yl_incl = np.zeros((3, parameters.n_spars,
-                                      derived_geometry.N_ribs))
-        spar_caps_yr_incl = np.zeros((3, parameters.n_spars,
-                                      derived_geometry.N_ribs))
         # Linear interpolation for the spar caps' width
         sc_xl_width = np.zeros((3, derived_geometry.N_ribs))
         sc_xr_width = np.zeros((3, derived_geometry.N_ribs))
@@ -80,47 +64,31 @@ class SparsAndCapsCoords:
         spar_caps_yr = spars_nodes_y
 
         # Calculate the intersection with the ribs that define their coordinates
-        for i in range(0, parameters.n_spars):
-            for j in range(0, derived_geometry.N_ribs):
-                for k in range(0, 3):
-                    x_int, y_int =\
-                        intersection(
-                            spars_nodes_x[k, i, :], spars_nodes_y[k, i, :],
-                            wing.rib_line_x[k, j, :],
-                            wing.rib_line_y[k, j, :])
-                    x_int_sc_l, y_int_sc_l =\
-                        intersection(
-                            spar_caps_xl[k, i, :], spar_caps_yl[k, i, :],
-                            wing.rib_line_x[k, j, :],
-                            wing.rib_line_y[k, j, :])
-                    x_int_sc_r, y_int_sc_r =\
-                        intersection(
-                            spar_caps_xr[k, i, :], spar_caps_yr[k, i, :],
-                            wing.rib_line_x[k, j, :],
-                            wing.rib_line_y[k, j, :])
-                    if len(x_int) == 0:
-                        pass
-                    else:
-                        spars_nodes_x_incl[k, i, j] = x_int[0]
-                        spars_nodes_y_incl[k, i, j] = y_int[0]
-                        spar_caps_xl_incl[k, i, j] = x_int_sc_l[0]
-                        spar_caps_yl_incl[k, i, j] = y_int_sc_l[0]
-                        spar_caps_xr_incl[k, i, j] = x_int_sc_r[0]
-                        spar_caps_yr_incl[k, i, j] = y_int_sc_r[0]
+        # for all layers, spars/stringers and ribs at once, in the form
+        # (layer, spar, rib)
+        rib_line_x = wing.rib_line_x[:, np.newaxis, :, :]
+        rib_line_y = wing.rib_line_y[:, np.newaxis, :, :]
+        spars_nodes_x_incl, spars_nodes_y_incl, found =\
+            first_intersection(spars_nodes_x[:, :, np.newaxis, :],
+                               spars_nodes_y[:, :, np.newaxis, :],
+                               rib_line_x, rib_line_y)
+        spar_caps_xl_incl, spar_caps_yl_incl, _ =\
+            first_intersection(spar_caps_xl[:, :, np.newaxis, :],
+                               spar_caps_yl[:, :, np.newaxis, :],
+                               rib_line_x, rib_line_y)
+        spar_caps_xr_incl, spar_caps_yr_incl, _ =\
+            first_intersection(spar_caps_xr[:, :, np.newaxis, :],
+                               spar_caps_yr[:, :, np.newaxis, :],
+                               rib_line_x, rib_line_y)
+        # The spar caps are kept only where the spar meets the rib
+        for value in (spar_caps_xl_incl, spar_caps_yl_incl,
+                      spar_caps_xr_incl, spar_caps_yr_incl):
+            value[~found] = 0
 
-        for i in range(0, n_stringers_total):
-            for j in range(0, derived_geometry.N_ribs):
-                for k in range(0, 3):
-                    x_int_str, y_int_str =\
-                        intersection(
-                            stringers_nodes_x[k, i, :], stringers_nodes_y[k, i, :],
-                            wing.rib_line_x[k, j, :],
-                            wing.rib_line_y[k, j, :])
-                    if len(x_int_str) == 0:
-                        pass
-                    else:
-                        stringers_nodes_x_incl[k, i, j] = x_int_str[0]
-                        stringers_nodes_y_incl[k, i, j] = y_int_str[0]
+        stringers_nodes_x_incl, stringers_nodes_y_incl, _ =\
+            first_intersection(stringers_nodes_x[:, :, np.newaxis, :],
+                               stringers_nodes_y[:, :, np.newaxis, :],
+                               rib_line_x, rib_line_y)
 
         self.Spars_nodes_X = spars_nodes_x_incl
         self.Spars_nodes_Y = spars_nodes_y_incl
@@ -0,0 +1,211 @@
+"""
+A script that contains the on-disk cache of the wing generation stages.
+
+A StageGraph with a StageCache stores the result of every stage it runs (its
+outputs, their fingerprints and the .tcl text) in one pickle file named by
+the stage key. The key is the fingerprint of the parameter fields the stage
+read and of its upstream outputs (see StageGraph.key), so a design that
+differs only in fields a stage doesn't read finds that stage in the cache,
+in the same or in another process. The key also covers the code of the stage
+(stage_graph.code_fingerprint) and the content of the uCRM-9 data files
+(crm_data_key), so the entries of older code or data are never served.
+
+Layout of the cache directory:
+- stages/<stage>.json : The upstream outputs and the recorded parameter
+fields of the stage, needed to compute its key before running it
+- entries/<key>.pkl : The stored results
+
+The modification time of an entry is its last use, and the least recently
+used entries are removed when the entries exceed max_bytes.
+
+Advices:
+- The entries of older code or data stay until they are evicted, call
+clear to remove them at once
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import airfoil_cache
+import read_oml
+
+CACHE_VERSION = 1
+
+
+def crm_data_key():
+    """
+    It's a function that hashes the uCRM-9 data files read by the stages.
+
+    Returns
+    -------
+    key : Hexadecimal string, or None if the files can't be read.
+    """
+    try:
+        files = [[name, size, digest] for name, size, _, digest
+                 in airfoil_cache.source_key(with_digest=True)]
+        files.append([os.path.basename(read_oml.OML_PATH),
+                      airfoil_cache.file_digest(read_oml.OML_PATH)])
+    except OSError:
+        return None
+    return hashlib.sha1(json.dumps(files).encode()).hexdigest()
+
+
+class StageCache:
+    """
+    A class that stores and finds stage results on disk.
+
+    Parameters
+    ----------
+    directory : The cache directory (created if missing).
+    max_bytes : Size limit of the stored entries.
+    bypass : If True, the cache is neither read nor written.
+    data_key : The key of the uCRM-9 data files (crm_data_key() if
+    None).
+    """
+
+    def __init__(self, directory='Stage_Cache', max_bytes=2 * 1024 ** 3,
+                 bypass=False, data_key=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self.version = CACHE_VERSION
+        self.data_key = crm_data_key() if data_key is None else data_key
+
+    def _path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def _write(self, path, data):
+        # Write to a temporary file and rename it, so that other processes
+        # never read a partial file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(handle, 'wb') as outfile:
+            outfile.write(data)
+        os.replace(temporary, path)
+
+    def stage_info(self, name):
+        """
+        It's a method that returns what a stage depends on.
+
+        Parameters
+        ----------
+        name : The name of the stage.
+
+        Returns
+        -------
+        inputs : The names of the upstream outputs the stage takes.
+        fields : Dictionary parameter object -> recorded field names.
+        Both are None if the stage was never stored.
+        """
+        try:
+            with open(self._path('stages', name + '.json'), 'r') as infile:
+                info = json.load(infile)
+        except (OSError, ValueError):
+            return None, None
+        if info.get('version') != self.version:
+            return None, None
+        return info['inputs'], info['fields']
+
+    def find(self, name, inputs, key):
+        """
+        It's a method that returns the stored result of a stage, if any.
+
+        Parameters
+        ----------
+        name : The name of the stage.
+        inputs : The names of the upstream outputs the stage takes now.
+        key : Function (name, inputs, fields) -> key of the stage for the
+        current design (StageGraph.key).
+
+        Returns
+        -------
+        entry : The StageEntry, or None if it isn't in the cache.
+        """
+        if self.bypass:
+            return None
+        stored_inputs, fields = self.stage_info(name)
+        if stored_inputs != inputs:
+            self.misses += 1
+            return None
+        return self.load(key(name, inputs, fields))
+
+    def load(self, key):
+        """
+        It's a method that returns the stored result of a stage key.
+
+        Returns
+        -------
+        entry : The StageEntry, or None if it isn't in the cache.
+        """
+        if self.bypass:
+            return None
+        path = self._path('entries', key + '.pkl')
+        try:
+            with open(path, 'rb') as infile:
+                entry = pickle.load(infile)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, name, entry):
+        """Store the StageEntry of a stage and evict old entries."""
+        if self.bypass:
+            return
+        info = {'version': self.version, 'inputs': entry.inputs,
+                'fields': entry.fields}
+        self._write(self._path('stages', name + '.json'),
+                    json.dumps(info, indent=1).encode())
+        self._write(self._path('entries', entry.key + '.pkl'),
+                    pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        self.evict()
+
+    def entries(self):
+        """List of (last use, bytes, path) of the stored entries."""
+        directory = self._path('entries')
+        if not os.path.isdir(directory):
+            return []
+        entries = []
+        for file_name in os.listdir(directory):
+            path = os.path.join(directory, file_name)
+            try:
+                stat = os.stat(path)
+            except OSError:  # Removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        """The bytes of the stored entries."""
+        return sum(entry[1] for entry in self.entries())
+
+    def evict(self):
+        """Remove the least recently used entries above max_bytes."""
+        entries = sorted(self.entries())
+        size = sum(entry[1] for entry in entries)
+        for _, n_bytes, path in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= n_bytes
+
+    def clear(self):
+        """Remove all the stored entries."""
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        """Dictionary with the hits, misses and stored bytes."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'bytes': self.size()}
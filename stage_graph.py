@@ -0,0 +1,462 @@
+"""
+A script that contains the dependency graph of the wing generation stages.
+
+The generation is split into stages (the geometry classes and the families
+of .tcl emitters). Each stage is a function that returns a dictionary of named
+outputs, and its arguments are the outputs of earlier stages, the parameter
+objects and, for the emitters, the .tcl file. While a stage runs, the
+parameter fields it reads are recorded, so the graph knows which fields and
+which upstream outputs each stage depends on.
+
+Every output gets a fingerprint (a hash of its content). When the same graph
+runs a changed design, a stage whose recorded fields and input fingerprints
+are unchanged isn't run again: its outputs and the .tcl text it wrote are
+reused from the previous run. If a changed field doesn't change the outputs
+of a stage, the stages after it are reused as well. With a
+stage_cache.StageCache, the results are also stored on disk and shared
+between processes and runs.
+
+The graph also records the time, output bytes and (when profiling) the peak
+memory of every stage, for the .json stage report (see write_report).
+Profiling is turned on by the profile argument of the drivers or by the
+PYPDMW_PROFILE environment variable.
+"""
+import copy
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import os
+import time
+import tracemalloc
+import types
+import numpy as np
+from tcl_writer import TclWriter
+
+PROFILE_ENV = 'PYPDMW_PROFILE'
+# The directory of the modules of the repository
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class FieldRecorder:
+    """
+    A class that wraps a parameters object and records the fields read.
+
+    The methods of the object are bound to the recorder, so the fields they
+    read are recorded too.
+    """
+
+    def __init__(self, target, fields):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_fields', fields)
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, '_target')
+        method = getattr(type(target), name, None)
+        if callable(method) and not isinstance(method, type):
+            return types.MethodType(method, self)
+        self._fields.add(name)
+        return getattr(target, name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('The parameters are read-only in a stage')
+
+
+def _update(digest, value, path):
+    if isinstance(value, FieldRecorder):
+        value = object.__getattribute__(value, '_target')
+    if value is None or isinstance(value, (bool, int, float, complex, str,
+                                           bytes, np.generic)):
+        digest.update(repr((type(value).__name__, value)).encode())
+        return
+    if id(value) in path:
+        digest.update(b'<cycle>')
+        return
+    path = path | {id(value)}
+    if isinstance(value, np.ndarray):
+        digest.update(repr(('ndarray', value.dtype.str, value.shape)).encode())
+        if value.dtype.hasobject:
+            for item in value.ravel():
+                _update(digest, item, path)
+        else:
+            digest.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif isinstance(value, dict):
+        digest.update(b'dict%d' % len(value))
+        for key, item in value.items():
+            _update(digest, key, path)
+            _update(digest, item, path)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(
+            value, (set, frozenset)) else value
+        digest.update(type(value).__name__.encode() + b'%d' % len(items))
+        for item in items:
+            _update(digest, item, path)
+    elif dataclasses.is_dataclass(value):
+        digest.update(type(value).__qualname__.encode())
+        for field in dataclasses.fields(value):
+            _update(digest, field.name, path)
+            _update(digest, getattr(value, field.name), path)
+    elif hasattr(value, '__dict__'):
+        digest.update(type(value).__qualname__.encode())
+        _update(digest, vars(value), path)
+    else:
+        digest.update(repr(value).encode())
+
+
+def fingerprint(*values):
+    """
+    It's a function that hashes the content of values.
+
+    Arrays are hashed with their type, shape and data, objects with their
+    attributes, so equal content gives equal fingerprints across runs.
+
+    Returns
+    -------
+    fingerprint : Hexadecimal string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _update(digest, values, frozenset())
+    return digest.hexdigest()
+
+
+def _source_module(value):
+    """The module of the repository that defines value, or None."""
+    module = value if isinstance(value, types.ModuleType) \
+        else inspect.getmodule(value)
+    path = getattr(module, '__file__', None)
+    if path and os.path.dirname(os.path.abspath(path)) == SOURCE_DIR:
+        return module
+    return None
+
+
+def _code_names(code):
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= _code_names(constant)
+    return names
+
+
+def _module_files(module, files):
+    # Add the source file of the module and of the repository modules it
+    # uses to files (file name -> sha1)
+    path = os.path.abspath(module.__file__)
+    name = os.path.basename(path)
+    if name in files:
+        return
+    with open(path, 'rb') as infile:
+        files[name] = hashlib.sha1(infile.read()).hexdigest()
+    for value in list(vars(module).values()):
+        dependency = _source_module(value)
+        if dependency is not None:
+            _module_files(dependency, files)
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint(function):
+    """
+    It's a function that hashes the code a stage function runs.
+
+    The source of the function and of the functions and classes of its own
+    module that it uses is hashed, together with the source files of the
+    other modules of the repository it uses (and of the modules these use).
+    The result is kept for the life of the process, like the loaded code.
+
+    Returns
+    -------
+    fingerprint : Hexadecimal string.
+    """
+    sources = {}
+    files = {}
+    pending = [function]
+    while pending:
+        value = pending.pop()
+        if value.__qualname__ in sources:
+            continue
+        try:
+            sources[value.__qualname__] = inspect.getsource(value)
+        except (OSError, TypeError):
+            sources[value.__qualname__] = value.__code__.co_code
+        if inspect.isclass(value):
+            pending.extend(member for member in vars(value).values()
+                           if inspect.isfunction(member))
+            continue
+        for name in _code_names(value.__code__):
+            target = value.__globals__.get(name)
+            module = _source_module(target)
+            if module is None:
+                continue
+            if module is inspect.getmodule(value) and \
+                    (inspect.isfunction(target) or inspect.isclass(target)):
+                pending.append(target)
+            elif module is not inspect.getmodule(value):
+                _module_files(module, files)
+    return fingerprint(sorted(sources.items()), sorted(files.items()))
+
+
+@dataclasses.dataclass
+class StageEntry:
+    """
+    It's a dataclass for the last result of one stage.
+    """
+    key: str
+    inputs: list  # Names of the upstream outputs the stage takes
+    fields: dict  # Parameter object name -> sorted names of the fields read
+    outputs: dict
+    fingerprints: dict  # Output name -> fingerprint
+    text: str = ''  # The .tcl text written by the stage
+    bytes: int = 0  # The bytes of the text
+
+
+class StageGraph:
+    """
+    A class that runs the stages of a design and reuses unchanged ones.
+
+    Keep the same StageGraph for a series of designs to regenerate each one
+    incrementally. Call start for every design, then run the stages in
+    order.
+
+    The keys, fingerprints and .tcl text of the stages are only computed
+    and kept when they can be reused (reuse is True or there is a cache).
+    Otherwise the stages are run directly and write straight to the file.
+
+    Parameters
+    ----------
+    cache : Optional stage_cache.StageCache. The stages not found in memory
+    are looked up there, and the stages run are stored there.
+    profile : If True, the peak memory of each stage is measured with
+    tracemalloc (which slows the stages down).
+    reuse : If True, the stages of the last design are kept in memory for
+    the next one. Use False for a graph that runs one design only.
+    """
+
+    def __init__(self, cache=None, profile=False, reuse=True):
+        self.cache = cache
+        self.profile = profile
+        self.reuse = reuse
+        self.entries = {}
+        self.runs = []
+        self.params = {}
+        self.values = {}
+        self.value_fingerprints = {}
+        self.code_keys = {}
+
+    def start(self, **params):
+        """
+        It's a method that starts a new design.
+
+        Parameters
+        ----------
+        params : The parameter objects of the design by name (e.g.
+        parameters=..., mesh_parameters=...).
+        """
+        self.params = params
+        self.values = {}
+        self.value_fingerprints = {}
+        self.runs = []
+
+    def keyed(self):
+        """True if the stages are keyed, to be reused or cached."""
+        return self.reuse or (self.cache is not None and
+                              not self.cache.bypass)
+
+    def put(self, **values):
+        """Add values computed outside the stages to the design."""
+        keyed = self.keyed()
+        for name, value in values.items():
+            self.values[name] = value
+            if keyed:
+                self.value_fingerprints[name] = fingerprint(value)
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def key(self, name, inputs, fields):
+        """
+        It's a method that returns the key of a stage for the current design.
+
+        The key is the fingerprint of the fields and inputs the stage depends
+        on, of its code (see code_fingerprint) and, with a cache, of the
+        uCRM-9 data files (StageCache.data_key).
+        """
+        field_values = [(obj, field, getattr(self.params[obj], field))
+                        for obj in sorted(fields) for field in fields[obj]]
+        return fingerprint(name, field_values,
+                           [(input_name, self.value_fingerprints[input_name])
+                            for input_name in inputs],
+                           self.code_keys.get(name),
+                           None if self.cache is None
+                           else self.cache.data_key)
+
+    def run(self, name, function, file=None, copy_inputs=False):
+        """
+        It's a method that runs a stage, or reuses a stored result.
+
+        The result is looked up in memory (the last design) and then in the
+        cache.
+
+        Parameters
+        ----------
+        name : The name of the stage.
+        function : The stage function. Its arguments are taken by name from
+        the parameter objects, from the outputs of earlier stages and, for
+        'file', from file (or, if the stage is keyed, from a buffer whose
+        text is kept and then written to file).
+        file : The TclWriter of the design (for emitter stages).
+        copy_inputs : If True, the stage gets copies of the upstream
+        outputs (for stages that modify their inputs).
+
+        Returns
+        -------
+        outputs : The dictionary of the outputs of the stage.
+        """
+        if self.profile:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory = tracemalloc.get_traced_memory()[0]
+        tic = time.perf_counter()
+        if self.keyed():
+            entry, source = self._run_keyed(name, function, file, copy_inputs)
+            if entry.text:
+                file.write(entry.text)
+            outputs, n_bytes = entry.outputs, entry.bytes
+        else:
+            source = 'run'
+            written = 0 if file is None else file.stats()['bytes']
+            kwargs = self._arguments(function, self.params, file, copy_inputs)
+            outputs = function(**kwargs)
+            self.values.update(outputs)
+            n_bytes = 0 if file is None else file.stats()['bytes'] - written
+        record = {'stage': name, 'reused': source != 'run', 'source': source,
+                  'time': time.perf_counter() - tic, 'bytes': n_bytes}
+        if self.profile:
+            record['peak_memory'] = tracemalloc.get_traced_memory()[1] - memory
+        self.runs.append(record)
+        return outputs
+
+    def _arguments(self, function, params, file, copy_inputs):
+        # The arguments of a stage by name (see run)
+        kwargs = {}
+        for argument in inspect.signature(function).parameters:
+            if argument in params:
+                kwargs[argument] = params[argument]
+            elif argument == 'file':
+                kwargs[argument] = file
+            else:
+                value = self.values[argument]
+                kwargs[argument] = copy.deepcopy(value) if copy_inputs \
+                    else value
+        return kwargs
+
+    def _run_keyed(self, name, function, file, copy_inputs):
+        # Find the entry of a stage in memory or in the cache, or run the
+        # stage into a private buffer, record what it read and store it
+        arguments = list(inspect.signature(function).parameters)
+        inputs = [argument for argument in arguments
+                  if argument not in self.params and argument != 'file']
+        self.code_keys[name] = code_fingerprint(function)
+        entry = self.entries.get(name)
+        source = 'memory'
+        if entry is None or entry.inputs != inputs or \
+                entry.key != self.key(name, inputs, entry.fields):
+            entry = None
+            if self.cache is not None:
+                source = 'disk'
+                entry = self.cache.find(name, inputs, self.key)
+
+        if entry is None:
+            source = 'run'
+            fields = {obj: set() for obj in self.params}
+            recorders = {obj: FieldRecorder(value, fields[obj])
+                         for obj, value in self.params.items()}
+            buffer = TclWriter() if file is not None else None
+            outputs = function(**self._arguments(function, recorders, buffer,
+                                                 copy_inputs))
+            text, n_bytes = '', 0
+            if buffer is not None:
+                text = buffer.getvalue()
+                n_bytes = buffer.stats()['bytes']
+            fields = {obj: sorted(names) for obj, names in fields.items()
+                      if names}
+            entry = StageEntry(self.key(name, inputs, fields), inputs, fields,
+                               outputs, {output: fingerprint(value)
+                                         for output, value in outputs.items()},
+                               text, n_bytes)
+            if self.cache is not None:
+                self.cache.store(name, entry)
+        if self.reuse:
+            self.entries[name] = entry
+        self.values.update(entry.outputs)
+        self.value_fingerprints.update(entry.fingerprints)
+        return entry, source
+
+    def dependencies(self):
+        """
+        It's a method that returns the dependency graph of the stages.
+
+        Returns
+        -------
+        graph : Dictionary stage -> {'fields': parameter fields read,
+        'inputs': upstream outputs taken}.
+        """
+        return {name: {'fields': entry.fields, 'inputs': entry.inputs}
+                for name, entry in self.entries.items()}
+
+    def reused(self):
+        """The names of the stages reused in the current design."""
+        return [run['stage'] for run in self.runs if run['reused']]
+
+    def report(self):
+        """
+        It's a method that summarizes the stages of the current design.
+
+        Returns
+        -------
+        report : Dictionary with the totals of time and bytes, the largest
+        peak memory (if profiled) and the record of each stage.
+        """
+        report = {'time': sum(run['time'] for run in self.runs),
+                  'bytes': sum(run['bytes'] for run in self.runs),
+                  'n_stages': len(self.runs),
+                  'n_reused': len(self.reused())}
+        if self.profile:
+            report['peak_memory'] = max(
+                (run.get('peak_memory', 0) for run in self.runs), default=0)
+        report['stages'] = self.runs
+        return report
+
+
+def profile_enabled(profile=None):
+    """
+    It's a function that tells if the stages should be profiled.
+
+    Parameters
+    ----------
+    profile : True or False to choose, or None to use the PYPDMW_PROFILE
+    environment variable (on if set to anything but '', '0' or 'false').
+
+    Returns
+    -------
+    enabled : Boolean.
+    """
+    if profile is not None:
+        return bool(profile)
+    return os.environ.get(PROFILE_ENV, '').lower() not in ('', '0', 'false')
+
+
+def write_report(graph, path, **info):
+    """
+    It's a function that writes the .json stage report of a design.
+
+    Parameters
+    ----------
+    graph : The StageGraph that ran the design.
+    path : Path of the .json file.
+    info : Other values to put in the report (e.g. the writer's stats).
+    """
+    report = dict(info)
+    report.update(graph.report())
+    with open(path, 'w') as outfile:
+        json.dump(report, outfile, indent=1)
@@ -1,19 +1,29 @@
 """A script that contains the SparsAndCapsCoords class."""
 
 import numpy as np
+from node_registry import NodeRegistry, id_table
 
 
 class SparsCapsIDs:
-    """A class that inserts the spar and caps coords into the XYZ arrays."""
+    """
+    A class that inserts the spar and caps coords into the XYZ arrays.
+
+    The IDs of the rib nodes are taken from the 'rib' family of the node
+    registry, in the form (layer, rib, node). A new registry is created if
+    none is given.
+    """
 
     def __init__(self, wing,  derived_geometry, spars_and_spar_caps,
-                 parameters):
+                 parameters, registry=None):
 
         self.coord_x = wing.X
         self.coord_y = wing.Y
         self.coord_z = wing.Z
         self.n_nodes = derived_geometry.n
         self.n_ribs = derived_geometry.N_ribs
+        self.registry = NodeRegistry() if registry is None else registry
+        if 'rib' not in self.registry.shapes:
+            self.registry.allocate('rib', self.coord_x.shape)
 
         spars_nodes_x = spars_and_spar_caps.Spars_nodes_X
         spar_caps_xl = spars_and_spar_caps.Spar_Caps_XL
@@ -26,89 +36,155 @@ class SparsCapsIDs:
         n_spars = parameters.n_spars
 
         # Initialize ID arrays that spar nodes will be stored
-        self.Spar_ID_Lower = np.zeros((3, n_ribs, n_spars))
-        self.Spar_Cap_ID_Lower_Left = np.zeros((3, n_ribs, n_spars))
-        self.Spar_Cap_ID_Lower_Right = np.zeros((3, n_ribs, n_spars))
-        self.stringer_id_lower = np.zeros((3, n_ribs, n_stringers_total))
-        self.Spar_ID_Upper = np.zeros((3, n_ribs, n_spars))
-        self.Spar_Cap_ID_Upper_Left = np.zeros((3, n_ribs, n_spars))
-        self.Spar_Cap_ID_Upper_Right = np.zeros((3, n_ribs, n_spars))
-        self.stringer_id_upper = np.zeros((3, n_ribs, n_stringers_total))
-
-        for l in range(0, 3):
-            for i in range(0, n_ribs):
-                for j in range(0, n_spars):
-                    # Lower nodes of spars
-                    for k in range(self.n_nodes, 2 * self.n_nodes):
-                        self.adjust_lower_nodes(l, i, j, k, spars_nodes_x,
-                                                self.Spar_ID_Lower)
-                        self.adjust_lower_nodes(l, i, j, k, spar_caps_xl,
-                                                self.Spar_Cap_ID_Lower_Left)
-                        self.adjust_lower_nodes(l, i, j, k, spar_caps_xr,
-                                                self.Spar_Cap_ID_Lower_Right)
-
-                    # Upper nodes of spars
-                    for k in range(0, self.n_nodes):
-                        self.adjust_upper_nodes(l, i, j, k, spars_nodes_x,
-                                                self.Spar_ID_Upper)
-                        self.adjust_upper_nodes(l, i, j, k, spar_caps_xl,
-                                                self.Spar_Cap_ID_Upper_Left)
-                        self.adjust_upper_nodes(l, i, j, k, spar_caps_xr,
-                                                self.Spar_Cap_ID_Upper_Right)
-                for j in range(0, n_stringers_total):
-                    for k in range(self.n_nodes, 2 * self.n_nodes):
-                        self.adjust_lower_nodes(l, i, j, k, stringers_x,
-                                                self.stringer_id_lower)
-                    for k in range(0, self.n_nodes):
-                        self.adjust_upper_nodes(l, i, j, k, stringers_x,
-                                                self.stringer_id_upper)
-        self.Spar_ID_Lower = self.Spar_ID_Lower.astype(int)
-        self.Spar_Cap_ID_Lower_Left = self.Spar_Cap_ID_Lower_Left.astype(int)
-        self.Spar_Cap_ID_Lower_Right = self.Spar_Cap_ID_Lower_Right.astype(int)
-        self.stringer_id_lower = self.stringer_id_lower.astype(int)
-        self.Spar_ID_Upper = self.Spar_ID_Upper.astype(int)
-        self.Spar_Cap_ID_Upper_Left = self.Spar_Cap_ID_Upper_Left.astype(int)
-        self.Spar_Cap_ID_Upper_Right = self.Spar_Cap_ID_Upper_Right.astype(int)
-        self.stringer_id_upper = self.stringer_id_upper.astype(int)
-
-    def adjust_lower_nodes(self, l, i, j, k, desired, id_s):
+        self.Spar_ID_Lower = id_table((3, n_ribs, n_spars))
+        self.Spar_Cap_ID_Lower_Left = id_table((3, n_ribs, n_spars))
+        self.Spar_Cap_ID_Lower_Right = id_table((3, n_ribs, n_spars))
+        self.stringer_id_lower = id_table((3, n_ribs, n_stringers_total))
+        self.Spar_ID_Upper = id_table((3, n_ribs, n_spars))
+        self.Spar_Cap_ID_Upper_Left = id_table((3, n_ribs, n_spars))
+        self.Spar_Cap_ID_Upper_Right = id_table((3, n_ribs, n_spars))
+        self.stringer_id_upper = id_table((3, n_ribs, n_stringers_total))
+
+        # The nodes of each spar (with its caps) and each stringer are
+        # inserted in turn, for all layers and ribs at once. The spar and its
+        # caps are given together, in the order they take a shared node.
+        spars = np.stack((spars_nodes_x, spar_caps_xl, spar_caps_xr), axis=-1)
+        for j in range(0, n_spars):
+            self.Spar_ID_Lower[:, :, j], self.Spar_Cap_ID_Lower_Left[:, :, j],\
+                self.Spar_Cap_ID_Lower_Right[:, :, j] = np.moveaxis(
+                    self.insert_nodes(spars[:, j, :, :], upper=False), -1, 0)
+            self.Spar_ID_Upper[:, :, j], self.Spar_Cap_ID_Upper_Left[:, :, j],\
+                self.Spar_Cap_ID_Upper_Right[:, :, j] = np.moveaxis(
+                    self.insert_nodes(spars[:, j, :, :], upper=True), -1, 0)
+        for j in range(0, n_stringers_total):
+            self.stringer_id_lower[:, :, j] = self.insert_nodes(
+                stringers_x[:, j, :, np.newaxis], upper=False)[:, :, 0]
+            self.stringer_id_upper[:, :, j] = self.insert_nodes(
+                stringers_x[:, j, :, np.newaxis], upper=True)[:, :, 0]
+
+    def insert_nodes(self, desired, upper):
         """
-        Put the desired upper coordinates in the XYZ & stores their index:
+        Put the desired coordinates in the XYZ & return their IDs.
+
+        Each desired x takes the node k of its rib curve with
+        x[k - 1] < x < x[k + 1] (x[k - 1] > x > x[k + 1] on the upper curve),
+        checked on all nodes at once. Its Y and Z are interpolated between the
+        two neighbours. The nodes are taken in ascending k and, at the same k,
+        in the order of the desired values, like a scan of the curve node by
+        node.
+
+        Parameters
+        ----------
+        desired : Array (layer, rib, value) of the desired x.
+        upper : True for the upper curve, False for the lower one.
+
+        Returns
+        -------
+        id_s : Array (layer, rib, value) of the node IDs (0 if not inserted).
         """
-        if k < 2 * self.n_nodes - 1 and \
-                self.coord_x[l, i, k - 1] < desired[l, j, i] < self.coord_x[l, i, k + 1]:
-            self.coord_x[l, i, k] = desired[l, j, i]
-            self.coord_z[l, i, k] = np.interp(self.coord_x[l, i, k],
-                                              [self.coord_x[l, i, k - 1],
-                                               self.coord_x[l, i, k + 1]],
-                                              [self.coord_z[l, i, k - 1],
-                                               self.coord_z[l, i, k + 1]])
-            self.coord_y[l, i, k] = np.interp(self.coord_x[l, i, k],
-                                              [self.coord_x[l, i, k - 1],
-                                               self.coord_x[l, i, k + 1]],
-                                              [self.coord_y[l, i, k - 1],
-                                               self.coord_y[l, i, k + 1]])
-            # Store indices
-            # (+1) because of the different indexing of python & HM
-            id_s[l, i, j] = (i * 2 * self.n_nodes + k + 1) + self.n_ribs * 240 * l
-            # return id_s
-    def adjust_upper_nodes(self, l, i, j, k, desired, id_s):
+        n_rows = 3 * self.n_ribs
+        n_values = desired.shape[-1]
+        coord_x = self.coord_x.reshape(n_rows, -1)
+        coord_y = self.coord_y.reshape(n_rows, -1)
+        coord_z = self.coord_z.reshape(n_rows, -1)
+        desired = desired.reshape(n_rows, n_values)
+        rows = np.arange(0, n_rows)[:, np.newaxis]
+        if upper:
+            # k - 1 = -1 is the last node of the lower curve (TE)
+            first, last = 0, self.n_nodes - 1
+        else:
+            first, last = self.n_nodes, 2 * self.n_nodes - 2
+
+        # The first node of each value, as in a scan of the curve:
+        # x[low] < x < x[high], with low/high the neighbours in increasing x
+        nodes = np.arange(first, last + 1)
+        step = -1 if upper else 1
+        valid = (coord_x[:, np.newaxis, nodes - step] <
+                 desired[:, :, np.newaxis]) & \
+            (desired[:, :, np.newaxis] < coord_x[:, np.newaxis, nodes + step])
+        inserted = np.any(valid, axis=2)
+        k = first + np.argmax(valid, axis=2)
+
+        # An inserted value changes the check of the next node. The rows where
+        # this changes the node of another value, where two values take the
+        # same node or where a value passes the check of a later node (on
+        # curves that aren't monotonic) are scanned node by node instead.
+        beyond = coord_x[rows, np.minimum(k + 2, last + 1)]
+        if upper:
+            desired_inc, beyond = -desired, -beyond
+        else:
+            desired_inc = desired
+        passes = (desired_inc[:, :, np.newaxis] <
+                  desired_inc[:, np.newaxis, :]) & \
+            (desired_inc[:, np.newaxis, :] < beyond[:, :, np.newaxis]) & \
+            (k < last)[:, :, np.newaxis]
+        offset = np.where(inserted[:, np.newaxis, :],
+                          k[:, np.newaxis, :] - k[:, :, np.newaxis], -1)
+        pairs = np.where(offset == 1, ~passes, passes) | (offset == 0)
+        pairs &= inserted[:, :, np.newaxis] & ~np.eye(n_values, dtype=bool)
+        again = valid & (nodes >= k[:, :, np.newaxis] + 2)
+        shared = np.any(pairs, axis=(1, 2)) | np.any(again, axis=(1, 2))
+        inserted[shared] = False
+
+        # Insert in the order of the scan, so that the neighbours of a node
+        # are already updated when it's inserted
+        order = np.argsort(np.where(inserted, k, 2 * self.n_nodes), axis=1,
+                           kind='stable')
+        for rank in range(0, n_values):
+            value = order[:, rank]
+            row = np.flatnonzero(inserted[rows[:, 0], value])
+            value = value[row]
+            node = k[row, value]
+            x = desired[row, value]
+            low, high = node - step, node + step
+            x_0 = coord_x[row, low]
+            x_1 = coord_x[row, high]
+            coord_x[row, node] = x
+            for coord in (coord_z, coord_y):
+                f_0 = coord[row, low]
+                f_1 = coord[row, high]
+                coord[row, node] = (f_1 - f_0) / (x_1 - x_0) * (x - x_0) + f_0
+
+        for row in np.flatnonzero(shared):
+            k[row], inserted[row] = self.scan_nodes(
+                coord_x[row], coord_y[row], coord_z[row], desired[row],
+                first, last, upper)
+
+        # Store the IDs of the nodes
+        l, i = np.divmod(rows, self.n_ribs)
+        id_s = self.registry.id_of('rib', (l, i, k))
+        return np.where(inserted, id_s, 0).reshape(3, self.n_ribs, n_values)
+
+    @staticmethod
+    def scan_nodes(coord_x, coord_y, coord_z, desired, first, last, upper):
         """
-        Put the desired upper coordinates in the XYZ & stores their index:
+        Put the desired coordinates in one rib curve, node by node.
+
+        Parameters
+        ----------
+        coord_x, coord_y, coord_z : The coordinates of the rib (updated).
+        desired : The desired x, in the order they're checked at each node.
+        first, last : The first and last node of the curve.
+        upper : True for the upper curve, False for the lower one.
+
+        Returns
+        -------
+        k : The node of each value.
+        inserted : True for the inserted values.
         """
-        if k < 2 * self.n_nodes - 1 and \
-                self.coord_x[l, i, k - 1] > desired[l, j, i] > self.coord_x[l, i, k + 1]:
-            self.coord_x[l, i, k] = desired[l, j, i]
-            self.coord_z[l, i, k] = np.interp(self.coord_x[l, i, k],
-                                              [self.coord_x[l, i, k + 1],
-                                               self.coord_x[l, i, k - 1]],
-                                              [self.coord_z[l, i, k + 1],
-                                               self.coord_z[l, i, k - 1]])
-            self.coord_y[l, i, k] = np.interp(self.coord_x[l, i, k],
-                                              [self.coord_x[l, i, k + 1],
-                                               self.coord_x[l, i, k - 1]],
-                                              [self.coord_y[l, i, k + 1],
-                                               self.coord_y[l, i, k - 1]])
-            # Store indices
-            # (+1) because of the different indexing of python & HM
-            id_s[l, i, j] = (i * 2 * self.n_nodes + k + 1) + self.n_ribs * 240 * l
+        k = np.zeros(len(desired), dtype=int)
+        inserted = np.zeros(len(desired), dtype=bool)
+        step = -1 if upper else 1
+        for node in range(first, last + 1):
+            # The neighbours in increasing x
+            low, high = node - step, node + step
+            for value, x in enumerate(desired):
+                if coord_x[low] < x < coord_x[high]:
+                    coord_x[node] = x
+                    coord_z[node] = np.interp(x, [coord_x[low], coord_x[high]],
+                                              [coord_z[low], coord_z[high]])
+                    coord_y[node] = np.interp(x, [coord_x[low], coord_x[high]],
+                                              [coord_y[low], coord_y[high]])
+                    k[value] = node
+                    inserted[value] = True
+        return k, inserted
@@ -1,4 +1,36 @@
 import numpy as np
+from node_classes import format_id_lists
+from node_registry import id_table
+
+
+def write_surfaces(entity, index, shape, prefix, suffix, file):
+    """
+    It's a function that writes all the surfaces of an entity at once.
+
+    The list_creation method of the entity is called once with broadcast
+    index arrays instead of once per surface, so the index offsets it
+    declares (e.g. ids_2[i + 1, j]) gather the curve IDs of all surfaces.
+    The surfaces get consecutive IDs in the order of the loops.
+
+    Parameters
+    ----------
+    entity : The surfaces object (list_creation, surfaces, surface_counter).
+    index : Tuple of broadcast index arrays, one per loop.
+    shape : The shape of the loops.
+    prefix, suffix : The text before and after the IDs of each surface.
+    file : The .tcl file.
+
+    A ValueError is raised if the ID tables are invalid (see
+    node_classes.format_id_lists).
+    """
+    text = format_id_lists(entity.list_creation(*index), shape, prefix,
+                           suffix)
+    file.write(text)
+    size = int(np.prod(shape))
+    entity.surfaces[...] = np.arange(
+        entity.surface_counter + 1,
+        entity.surface_counter + size + 1).reshape(entity.surfaces.shape)
+    entity.surface_counter += size
 
 
 class MultipleSurfacesThreeCurves:
@@ -12,7 +44,7 @@ class MultipleSurfacesThreeCurves:
         self.ids_2 = ids_2
         self.ids_3 = ids_3
 
-        self.surfaces = np.zeros((self.n_1, self.n_2))
+        self.surfaces = id_table((self.n_1, self.n_2))
 
         self.surface_counter = surface_counter
 
@@ -25,15 +57,10 @@ class MultipleSurfacesThreeCurves:
         return my_list
 
     def write_tcl(self, file):
-        for i in range(0, self.n_1):
-            for j in range(0, self.n_2):
-                my_list = self.list_creation(i, j)
-                my_str = ' '.join(map(str, my_list))
-                cmd = "*surfacemode 4\n*createmark lines 1 " + my_str
-                file.write(cmd)
-                file.write("\n*surfacesplineonlinesloop 1 1 0 65\n")
-                self.surface_counter += 1
-                self.surfaces[i, j] = self.surface_counter
+        index = np.ix_(range(0, self.n_1), range(0, self.n_2))
+        write_surfaces(self, index, (self.n_1, self.n_2),
+                       "*surfacemode 4\n*createmark lines 1 ",
+                       "\n*surfacesplineonlinesloop 1 1 0 65\n", file)
 
 
 class MultipleSurfacesFourCurves(MultipleSurfacesThreeCurves):
@@ -48,7 +75,7 @@ class MultipleSurfacesFourCurves(MultipleSurfacesThreeCurves):
         self.ids_3 = ids_3
         self.ids_4 = ids_4
 
-        self.surfaces = np.zeros((self.n_1, self.n_2))
+        self.surfaces = id_table((self.n_1, self.n_2))
         self.surface_counter = surface_counter
 
         self.write_tcl(file)
@@ -72,7 +99,7 @@ class SingleSurfacesFourCurves:
         self.ids_3 = ids_3
         self.ids_4 = ids_4
 
-        self.surfaces = np.zeros((self.n_1, 1))
+        self.surfaces = id_table((self.n_1, 1))
         self.surface_counter = surface_counter
 
         self.write_tcl(file)
@@ -85,14 +112,9 @@ class SingleSurfacesFourCurves:
         return my_list
 
     def write_tcl(self, file):
-        for i in range(0, self.n_1):
-            my_list = self.list_creation(i)
-            my_str = ' '.join(map(str, my_list))
-            cmd = "*surfacemode 4\n*createmark lines 1 " + my_str
-            file.write(cmd)
-            file.write("\n*surfacesplineonlinesloop 1 1 0 65\n")
-            self.surface_counter += 1
-            self.surfaces[i, 0] = self.surface_counter
+        write_surfaces(self, (np.arange(0, self.n_1),), (self.n_1,),
+                       "*surfacemode 4\n*createmark lines 1 ",
+                       "\n*surfacesplineonlinesloop 1 1 0 65\n", file)
 
 
 class SingleSurfacesThreeCurves(SingleSurfacesFourCurves):
@@ -105,8 +127,8 @@ class SingleSurfacesThreeCurves(SingleSurfacesFourCurves):
         self.ids_2 = ids_2
         self.ids_3 = ids_3
 
-        self.surfaces = np.zeros((self.n_1, 1))
-        self.components = np.zeros((self.n_1, 1))
+        self.surfaces = id_table((self.n_1, 1))
+        self.components = id_table((self.n_1, 1))
         self.surface_counter = surface_counter
 
         self.write_tcl(file)
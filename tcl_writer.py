@@ -0,0 +1,95 @@
+"""
+A script that contains the buffered sink for the generated .tcl commands.
+
+All the emitters (curves, surfaces, components, mesh, equivalence) write to a
+TclWriter instead of a raw file. The writer collects the text in memory and
+passes it to its target in large chunks, so that the target sees one write
+per chunk instead of several per entity.
+"""
+import io
+import os
+
+
+class TclWriter:
+    """
+    A class that buffers .tcl commands and flushes them by size.
+
+    Parameters
+    ----------
+    target : Path of the .tcl file, an open file object, or None for an
+    in-memory buffer (see getvalue).
+    chunk_size : Number of characters to collect before each flush.
+    """
+
+    def __init__(self, target=None, chunk_size=1 << 20):
+        self.chunk_size = chunk_size
+        self.bytes_written = 0
+        self.commands_written = 0
+        self.flushes = 0
+        self._chunk = []
+        self._chunk_length = 0
+        self._owns_target = False
+        if target is None:
+            self._target = io.BytesIO()
+            self._text_target = False
+        elif isinstance(target, (str, os.PathLike)):
+            self._target = open(target, 'wb')
+            self._text_target = False
+            self._owns_target = True
+        else:
+            self._target = target
+            self._text_target = isinstance(target, io.TextIOBase)
+
+    def write(self, text):
+        """
+        Append text to the current chunk and flush it if it's full.
+
+        Every newline counts as the end of one command.
+        """
+        self._chunk.append(text)
+        self._chunk_length += len(text)
+        self.commands_written += text.count('\n')
+        if self._chunk_length >= self.chunk_size:
+            self.flush()
+
+    def writelines(self, lines):
+        """Append an iterable of strings (see write)."""
+        self.write(''.join(lines))
+
+    def flush(self):
+        """Pass the current chunk to the target."""
+        if not self._chunk:
+            return
+        data = ''.join(self._chunk)
+        self._chunk = []
+        self._chunk_length = 0
+        encoded = data.encode('utf-8')
+        self.bytes_written += len(encoded)
+        self._target.write(data if self._text_target else encoded)
+        self.flushes += 1
+
+    def getvalue(self):
+        """The text written so far, for in-memory writers only."""
+        if not isinstance(self._target, io.BytesIO):
+            raise TypeError('getvalue() needs an in-memory TclWriter')
+        self.flush()
+        return self._target.getvalue().decode('utf-8')
+
+    def close(self):
+        """Flush and close the target if the writer opened it."""
+        self.flush()
+        if self._owns_target:
+            self._target.close()
+
+    def stats(self):
+        """Dictionary with the bytes and commands written so far."""
+        return {'bytes': self.bytes_written + len(
+                    ''.join(self._chunk).encode('utf-8')),
+                'commands': self.commands_written,
+                'flushes': self.flushes}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
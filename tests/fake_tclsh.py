@@ -0,0 +1,61 @@
+"""
+A stand-in for the HyperMesh batch executable, used by the tests.
+
+fake_tclsh.py [-tcl] <script> runs a script of a tiny Tcl-like language, one
+command per line:
+- puts <text> : prints the text ('[clock milliseconds]' is replaced by the
+time)
+- after <ms> : sleeps
+- error <text> : prints the text and stops with the return code 1
+- exit <code> and *quit : end the process
+- anything else (e.g. *deletemodel) is ignored
+
+The exit code of a script is 1 after an error and 0 otherwise. If the script
+is the loader of hm_session, the programs are read from stdin and answered
+with the line protocol of hm_session.BatchSession instead.
+"""
+import sys
+import time
+
+END_MARKER = '# __PYPDMW_END__'
+DONE_MARKER = '__PYPDMW_DONE__'
+
+
+def evaluate(text):
+    """Run the commands of a program and return its Tcl return code."""
+    for line in text.splitlines():
+        command, _, argument = line.strip().partition(' ')
+        if command == 'puts':
+            print(argument.replace('[clock milliseconds]',
+                                   '%d' % (time.time() * 1000)), flush=True)
+        elif command == 'after':
+            time.sleep(int(argument) / 1000)
+        elif command == 'error':
+            print(argument, flush=True)
+            return 1
+        elif command == 'exit':
+            sys.exit(int(argument or 0))
+        elif command == '*quit':
+            sys.exit(0)
+    return 0
+
+
+def serve():
+    """Answer the programs of a BatchSession read from stdin."""
+    program = []
+    for line in sys.stdin:
+        if line.startswith(END_MARKER + ' '):
+            code = evaluate(''.join(program))
+            print(DONE_MARKER, line.split()[2], code, flush=True)
+            program = []
+        else:
+            program.append(line)
+
+
+if __name__ == '__main__':
+    with open(sys.argv[-1], 'r') as infile:
+        Text = infile.read()
+    if END_MARKER in Text:
+        serve()
+    else:
+        sys.exit(evaluate(Text))
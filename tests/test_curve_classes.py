@@ -0,0 +1,77 @@
+import io
+import types
+import numpy as np
+import pytest
+import curve_classes
+
+SPLINE = ("\n*createvector 1 1 0 0\n*createvector 2 1 0 0"
+          "\n*linecreatespline nodes 1 0 0 1 2\n")
+
+
+def commands(lists, suffix):
+    # The text of the loops over the entities, one list of IDs at a time
+    return ''.join("*createlist nodes 1 " + ' '.join(map(str, ids)) + suffix
+                   for ids in lists)
+
+
+def rib_parameters(n_stringers):
+    return types.SimpleNamespace(
+        n_stringers=n_stringers,
+        stringers_pos=lambda: np.zeros(n_stringers))
+
+
+@pytest.mark.parametrize('dtype', [np.int32, float])
+def test_multiple_curves(dtype):
+    ids_1 = np.arange(1, 13, dtype=dtype).reshape(3, 4)
+    ids_2 = ids_1 + 100
+    file = io.StringIO()
+    curves = curve_classes.SparAndSparCapCurves(2, 4, ids_1, ids_2, 7, file)
+    assert file.getvalue() == commands(
+        [[ids_1[i, j], ids_2[i + 1, j]] for i in range(0, 2)
+         for j in range(0, 4)], SPLINE)
+    assert curves.curves.ravel().tolist() == list(range(8, 16))
+    assert curves.curve_counter == 15
+
+
+def test_leading_edge_curves():
+    ids = np.array([[5], [9], [40]], dtype=np.int32)
+    file = io.StringIO()
+    curves = curve_classes.LeadingTrailingEdgeCurves(3, 1, ids, 2, file)
+    assert file.getvalue() == commands(
+        [[5, 9], [9, 40]], "\n*linecreatefromnodes 1 0 150 5 179\n")
+    assert curves.curves.ravel().tolist() == [3, 4]
+
+
+@pytest.mark.parametrize('lower', [False, True])
+def test_rib_curves(lower):
+    # 2 ribs, 2 spars and 1 stringer: 3 * 2 + 1 + 1 curves per rib
+    ids = np.cumsum(np.arange(2, 20).reshape(2, 9), axis=1) + \
+        np.array([[0], [500]])
+    if lower:
+        rib_class = curve_classes.LowerRibCurve
+        lists = [range(ids[i, j], ids[i, j + 1] + 1)
+                 for i in range(0, 2) for j in range(0, 8)]
+    else:
+        rib_class = curve_classes.UpperRibCurve
+        ids = ids[:, ::-1]
+        lists = [range(ids[i, j + 1], ids[i, j] + 1)
+                 for i in range(0, 2) for j in range(0, 8)]
+    file = io.StringIO()
+    curves = rib_class(2, 2, ids, rib_parameters(1), 0, file)
+    assert file.getvalue() == commands(lists, SPLINE)
+    assert curves.curves.ravel().tolist() == list(range(1, 17))
+
+
+def test_invalid_id_tables():
+    ids = np.arange(1, 13).reshape(3, 4)
+    with pytest.raises(ValueError):
+        curve_classes.MultipleCurves(3, 4, ids, -ids, 0, io.StringIO())
+    with pytest.raises(ValueError):
+        curve_classes.MultipleCurves(3, 4, ids, ids + 0.5, 0, io.StringIO())
+    with pytest.raises(ValueError):
+        curve_classes.MultipleCurves(3, 4, ids, ids[..., np.newaxis], 0,
+                                     io.StringIO())
+    # Rib curves without nodes (the IDs of the lower curve decrease)
+    with pytest.raises(ValueError):
+        curve_classes.LowerRibCurve(2, 2, np.arange(18, 0, -1).reshape(2, 9),
+                                    rib_parameters(1), 0, io.StringIO())
@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import pytest
+from hm_session import BatchSession, session_program
+
+FAKE_TCLSH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'fake_tclsh.py')
+
+
+@pytest.fixture
+def session(tmp_path):
+    with BatchSession([sys.executable, FAKE_TCLSH],
+                      log_dir=str(tmp_path / 'logs'),
+                      reset_timeout=5) as batch_session:
+        yield batch_session
+
+
+def write_script(tmp_path, name, text):
+    path = tmp_path / (name + '.tcl')
+    path.write_text(text)
+    return str(path)
+
+
+def test_session_program_drops_quit():
+    text = '*createnode 0 0 0\n  *quit 1\n*deletemodel\n*quit'
+    assert session_program(text) == '*createnode 0 0 0\n*deletemodel'
+
+
+def test_one_job(session, tmp_path):
+    job = session.run(write_script(tmp_path, 'wing', 'puts hello\n*quit 1'))
+    assert job.status == 'done'
+    assert job.returncode == 0
+    assert job.log_path == str(tmp_path / 'logs' / 'wing.log')
+    with open(job.log_path, 'r') as log:
+        assert log.read() == 'hello\n'
+    # The *quit line was dropped, so the process is still alive
+    assert session.alive()
+
+
+def test_several_jobs_share_one_process(session, tmp_path):
+    jobs = [session.run(write_script(tmp_path, 'job%d' % i,
+                                     'puts job %d\n*quit' % i))
+            for i in range(0, 4)]
+    assert [job.status for job in jobs] == ['done'] * 4
+    assert session.starts == 1
+    for i, job in enumerate(jobs):
+        with open(job.log_path, 'r') as log:
+            assert log.read() == 'job %d\n' % i
+
+
+def test_failing_job(session, tmp_path):
+    failed = session.run(write_script(tmp_path, 'bad', 'error boom\n'))
+    assert failed.status == 'failed'
+    assert failed.returncode == 1
+    with open(failed.log_path, 'r') as log:
+        assert 'boom' in log.read()
+    # The session goes on with the next job
+    job = session.run(write_script(tmp_path, 'good', 'puts ok\n'))
+    assert job.status == 'done'
+    assert session.starts == 1
+
+
+def test_crashed_session_is_restarted(session, tmp_path):
+    crashed = session.run(write_script(tmp_path, 'crash', 'exit 3\n'))
+    assert crashed.status == 'failed'
+    assert crashed.returncode is None
+    job = session.run(write_script(tmp_path, 'good', 'puts ok\n'))
+    assert job.status == 'done'
+    assert session.starts == 2
+
+
+def test_timeout(session, tmp_path):
+    job = session.run(write_script(tmp_path, 'slow', 'after 10000\n'),
+                      timeout=0.5)
+    assert job.status == 'timeout'
+    assert job.wall_time < 5
+    assert not session.alive()
+
+
+def test_stuck_reset_stops_the_session(tmp_path):
+    with BatchSession([sys.executable, FAKE_TCLSH],
+                      reset_command='after 10000',
+                      log_dir=str(tmp_path / 'logs'),
+                      reset_timeout=0.5) as batch_session:
+        tic = time.perf_counter()
+        job = batch_session.run(write_script(tmp_path, 'wing', 'puts hi\n'))
+        assert time.perf_counter() - tic < 5
+        assert job.status == 'done'
+        assert not batch_session.alive()
+        with open(job.log_path, 'r') as log:
+            assert 'reset timed out' in log.read()
+        job = batch_session.run(write_script(tmp_path, 'next', 'puts hi\n'))
+        assert job.status == 'done'
+        assert batch_session.starts == 2
@@ -0,0 +1,44 @@
+import io
+import numpy as np
+import pytest
+from node_classes import MultipleNodes
+from node_registry import NodeRegistry
+
+
+def test_multiple_nodes_write_the_template():
+    rng = np.random.default_rng(1)
+    coords = rng.uniform(-2e8, 2e8, (3, 500))
+    coords[:, :10] = rng.uniform(-10, 10, (3, 10))
+    coords[0, 10] = np.nan
+    file = io.StringIO()
+    registry = NodeRegistry(node_counter=7)
+    nodes = MultipleNodes(*coords, registry, 'rib', file)
+    expected = ''.join(MultipleNodes.template % tuple(point)
+                       for point in coords.T)
+    assert file.getvalue() == expected
+    assert nodes.ids.ravel().tolist() == list(range(8, 508))
+    assert nodes.node_counter == registry.node_counter == 507
+
+
+@pytest.mark.parametrize('chunk', [1, 3, 100000])
+def test_multiple_nodes_chunks(chunk):
+    coords = np.array([[1234567890.1234567, 99999999.99999995, 1e8, -0.0],
+                       [-0.00000015, 0.00000005, 2.5e-8, 1.00000005],
+                       [1e300, np.inf, 0.0, -7.25]])
+    nodes = MultipleNodes(*coords, NodeRegistry(), 'rib', io.StringIO())
+    file = io.StringIO()
+    nodes.write_tcl(file, chunk)
+    assert file.getvalue() == ''.join(MultipleNodes.template % tuple(point)
+                                      for point in coords.T)
+
+
+def test_multiple_nodes_use_an_allocated_family():
+    registry = NodeRegistry()
+    registry.allocate('rib', (2, 3))
+    ids = registry.allocate('flange', (2, 2))
+    coords = np.ones((3, 2, 2))
+    nodes = MultipleNodes(*coords, registry, 'flange', io.StringIO())
+    np.testing.assert_array_equal(nodes.ids, ids)
+    assert nodes.node_counter == 10
+    with pytest.raises(ValueError):
+        MultipleNodes(*coords, registry, 'rib', io.StringIO())
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from node_registry import ID_DTYPE, NodeRegistry, id_table
+
+
+def test_allocate_gives_contiguous_blocks():
+    registry = NodeRegistry(node_counter=10)
+    rib = registry.allocate('rib', (3, 2, 4))
+    flange = registry.allocate('flange', 5)
+    assert rib.dtype == ID_DTYPE and rib.shape == (3, 2, 4)
+    assert rib.ravel().tolist() == list(range(11, 35))
+    assert flange.tolist() == list(range(35, 40))
+    assert registry.start('rib') == 10 and registry.start('flange') == 34
+    assert registry.node_counter == 39
+    np.testing.assert_array_equal(registry.ids('rib'), rib)
+
+
+def test_allocate_twice():
+    registry = NodeRegistry()
+    registry.allocate('rib', (2, 3))
+    with pytest.raises(ValueError):
+        registry.allocate('rib', (2, 3))
+
+
+def test_id_of_matches_ids():
+    registry = NodeRegistry(node_counter=3)
+    registry.allocate('rib', (3, 4, 5))
+    ids = registry.allocate('flange', (4, 2))
+    l, i, k = np.meshgrid(range(0, 3), range(0, 4), range(0, 5),
+                          indexing='ij')
+    np.testing.assert_array_equal(registry.id_of('rib', (l, i, k)),
+                                  registry.ids('rib'))
+    # Broadcast indices, like the rows and node columns of store_spar_ids
+    rows = np.arange(0, 4)[:, np.newaxis]
+    assert registry.id_of('flange', (rows, [1, 0])).tolist() == \
+        ids[:, [1, 0]].tolist()
+    assert registry.id_of('flange', (3, 1)).dtype == ID_DTYPE
+
+
+def test_allocate_past_the_largest_id():
+    largest = np.iinfo(ID_DTYPE).max
+    registry = NodeRegistry(node_counter=largest - 10)
+    ids = registry.allocate('rib', 10)
+    assert ids[-1] == largest
+    with pytest.raises(OverflowError):
+        registry.allocate('flange', 1)
+    assert 'flange' not in registry.shapes
+    assert registry.node_counter == largest
+
+
+def test_id_table():
+    table = id_table((2, 3))
+    assert table.dtype == ID_DTYPE and not table.any()
@@ -0,0 +1,66 @@
+import os
+import numpy as np
+import pytest
+import read_data
+from read_data import parse_nodes, read_nodes
+
+
+def write_export(path, n_ribs=3, n_points=4, seed=0):
+    # "id x y z" lines in a shuffled order
+    rng = np.random.default_rng(seed)
+    n_nodes = 2 * n_ribs * n_points
+    coords = np.vstack((np.arange(1, n_nodes + 1),
+                        rng.uniform(0, 1, (3, n_nodes))))
+    coords = coords[:, rng.permutation(n_nodes)]
+    np.savetxt(path, coords.T, fmt='%d %.6f %.6f %.6f')
+    return str(path)
+
+
+def test_parse_nodes_sorts_in_selig_format(tmp_path):
+    coords = parse_nodes(write_export(tmp_path / 'nodes.txt'), n_points=4,
+                         layout_path=str(tmp_path / 'missing.json'))
+    assert coords.shape == (4, 3, 8)
+    upper = coords[:, :, 0:4]
+    lower = coords[:, :, 4:8]
+    assert np.all(np.diff(upper[1], axis=1) <= 0)
+    assert np.all(np.diff(lower[1], axis=1) >= 0)
+    # The upper curve of each rib has the lower IDs
+    assert np.all(upper[0].max(axis=1) < lower[0].min(axis=1))
+
+
+def test_sidecar_round_trip(tmp_path):
+    path = write_export(tmp_path / 'nodes.txt')
+    first = read_nodes(path, n_points=4)
+    assert os.path.isfile(path + '.npy') and os.path.isfile(path + '.json')
+    second = read_nodes(path)
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_array_equal(second, parse_nodes(path, n_points=4))
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path):
+    path = write_export(tmp_path / 'nodes.txt')
+    old = np.array(read_nodes(path, n_points=4))
+    write_export(path, n_ribs=5, seed=1)
+    new = read_nodes(path, n_points=4)
+    assert new.shape == (4, 5, 8)
+    assert not np.array_equal(new[1, 0:3], old[1])
+    np.testing.assert_array_equal(new, parse_nodes(path, n_points=4))
+
+
+def test_unwritable_sidecar_returns_the_parsed_nodes(tmp_path, monkeypatch):
+    def fail(path, write):
+        raise PermissionError('read-only directory')
+
+    monkeypatch.setattr(read_data, 'write_atomic', fail)
+    path = write_export(tmp_path / 'nodes.txt')
+    coords = read_nodes(path, n_points=4)
+    assert not os.path.exists(path + '.npy')
+    assert not coords.flags.writeable
+    np.testing.assert_array_equal(coords, parse_nodes(path, n_points=4))
+
+
+def test_unknown_layout(tmp_path):
+    with pytest.raises(ValueError):
+        read_nodes(write_export(tmp_path / 'nodes.txt'),
+                   layout_path=str(tmp_path / 'missing.json'))
@@ -0,0 +1,94 @@
+import os
+import sys
+import pytest
+import run_arg
+from run_arg import BatchJobPool, run_argument
+
+FAKE_TCLSH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'fake_tclsh.py')
+
+
+def write_script(tmp_path, name, text):
+    path = tmp_path / (name + '.tcl')
+    path.write_text(text)
+    return str(path)
+
+
+def read_log(job):
+    with open(job.log_path, 'r') as log:
+        return log.read()
+
+
+@pytest.mark.parametrize('persistent', [False, True])
+def test_slots_limit_the_concurrent_jobs(tmp_path, persistent):
+    text = 'puts [clock milliseconds]\nafter 300\nputs [clock milliseconds]\n'
+    with BatchJobPool([sys.executable, FAKE_TCLSH], n_slots=2,
+                      log_dir=str(tmp_path / 'logs'),
+                      persistent=persistent) as pool:
+        jobs = pool.run([write_script(tmp_path, 'job%d' % i, text)
+                         for i in range(0, 4)])
+    assert [job.status for job in jobs] == ['done'] * 4
+    intervals = [[int(line) for line in read_log(job).split()]
+                 for job in jobs]
+    # Number of jobs running at the start of each job
+    running = [sum(other_start <= start < other_end
+                   for other_start, other_end in intervals)
+               for start, _ in intervals]
+    assert max(running) == 2
+    if persistent:
+        assert sum(session.starts for session in pool.sessions) == 2
+
+
+def test_logs_and_names(tmp_path):
+    with BatchJobPool([sys.executable, FAKE_TCLSH],
+                      log_dir=str(tmp_path / 'logs')) as pool:
+        first = pool.submit(write_script(tmp_path, 'wing', 'puts one\n'))
+        second = pool.submit(write_script(tmp_path, 'tail', 'puts two\n'),
+                             name='named')
+    assert first.log_path == str(tmp_path / 'logs' / '000_wing.log')
+    assert second.log_path == str(tmp_path / 'logs' / 'named.log')
+    assert read_log(first) == 'one\n'
+    assert read_log(second) == 'two\n'
+
+
+def test_timeout_kills_the_job(tmp_path):
+    with BatchJobPool([sys.executable, FAKE_TCLSH], timeout=0.5,
+                      log_dir=str(tmp_path / 'logs')) as pool:
+        slow = pool.submit(write_script(tmp_path, 'slow', 'after 10000\n'))
+        fast = pool.submit(write_script(tmp_path, 'fast', 'after 1000\n'),
+                           timeout=30)
+        pool.wait()
+    assert slow.status == 'timeout'
+    assert slow.returncode is None
+    assert slow.wall_time < 5
+    # The timeout of the job overrides the pool's
+    assert fast.status == 'done'
+
+
+def test_non_zero_exit(tmp_path):
+    with BatchJobPool([sys.executable, FAKE_TCLSH],
+                      log_dir=str(tmp_path / 'logs')) as pool:
+        jobs = pool.run([write_script(tmp_path, 'exit', 'exit 3\n'),
+                         write_script(tmp_path, 'error', 'error boom\n')])
+    assert [job.status for job in jobs] == ['failed', 'failed']
+    assert [job.returncode for job in jobs] == [3, 1]
+    assert read_log(jobs[1]) == 'boom\n'
+
+
+def test_missing_executable(tmp_path):
+    with BatchJobPool(str(tmp_path / 'missing'),
+                      log_dir=str(tmp_path / 'logs')) as pool:
+        job = pool.submit(write_script(tmp_path, 'wing', 'puts one\n'))
+    assert job.status == 'error'
+    assert job.error
+
+
+def test_run_argument_runs_a_batch_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_arg, 'check_path', lambda: (
+        str(tmp_path) + '/', 'gui', [sys.executable, FAKE_TCLSH]))
+    monkeypatch.chdir(tmp_path)
+    write_script(tmp_path, 'wing', 'puts meshed\n')
+    job = run_argument('wing.tcl')
+    assert job.status == 'done'
+    assert job.log_path == os.path.join('HM_Files', 'logs', '000_wing.log')
+    assert read_log(job) == 'meshed\n'
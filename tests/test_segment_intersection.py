@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from segment_intersection import first_intersection, intersections
+
+# Pairs of curves (x1, y1, x2, y2) and the crossings (x, y) that
+# intersect.intersection finds, in its order
+CASES = {
+    'two crossings': (([0, 1, 2], [0, 1, 0], [0, 2], [0.5, 0.5]),
+                      ([0.5, 1.5], [0.5, 0.5])),
+    # The vertex is the end of two segments, so it's found twice
+    'vertex on the line': (([0, 1, 2], [0, 1, 0], [0, 2], [1, 1]),
+                           ([1, 1], [1, 1])),
+    'endpoint on the line': (([0, 1], [0, 1], [-1, 1], [1, 1]), ([1], [1])),
+    'touching endpoints': (([0, 1], [0, 1], [1, 2], [1, 0]), ([1], [1])),
+    'vertical segment': (([1, 1], [-1, 1], [0, 2], [0, 0]), ([1], [0])),
+    'parallel': (([0, 1], [0, 0], [0, 1], [1, 1]), ([], [])),
+    'collinear overlap': (([0, 2], [0, 0], [1, 3], [0, 0]), ([], [])),
+    'no crossing': (([0, 1], [0, 1], [5, 6], [0, 0]), ([], [])),
+}
+
+
+def spanwise_curves():
+    rng = np.random.default_rng(0)
+    # (layer, curve, point) curves along y and (layer, 1, rib, 2) rib lines
+    y = np.cumsum(rng.uniform(0.5, 1.5, (3, 4, 30)), axis=-1)
+    x = rng.uniform(0, 1, (3, 4, 30)) + np.arange(4)[:, np.newaxis]
+    rib_y = np.sort(rng.uniform(0, 30, (3, 1, 25, 1)), axis=2) + \
+        np.array([-2.0, 2.0])
+    rib_x = np.broadcast_to(np.array([-1.0, 5.0]), rib_y.shape)
+    return (x[:, :, np.newaxis, :], y[:, :, np.newaxis, :], rib_x, rib_y)
+
+
+@pytest.mark.parametrize('chunk_pairs', [1, 7, 100, 1 << 30])
+def test_chunks_give_the_same_crossings(chunk_pairs):
+    curves = spanwise_curves()
+    expected = intersections(*curves, chunk_pairs=1 << 30)
+    result = intersections(*curves, chunk_pairs=chunk_pairs)
+    assert result[3] == expected[3] == (3, 4, 25)
+    for value, reference in zip(result[:3], expected[:3]):
+        np.testing.assert_array_equal(value, reference)
+
+
+@pytest.mark.parametrize('name', CASES)
+def test_expected_crossings(name):
+    curves, (x_expected, y_expected) = CASES[name]
+    curves = [np.array(values, dtype=float) for values in curves]
+    batch, x, y, shape = intersections(*curves)
+    assert shape == () and np.all(batch == 0)
+    assert x.tolist() == x_expected and y.tolist() == y_expected
+    x, y, found = first_intersection(*curves)
+    assert found == bool(x_expected)
+    if found:
+        assert (x, y) == (x_expected[0], y_expected[0])
+
+
+def test_batch_of_cases_matches_intersect():
+    intersect = pytest.importorskip('intersect')
+    # The cases with two points per curve, in one batch
+    cases = [curves for curves, _ in CASES.values() if len(curves[0]) == 2]
+    x1, y1, x2, y2 = (np.array(values, dtype=float)
+                      for values in zip(*cases))
+    batch, x, y, shape = intersections(x1, y1, x2, y2)
+    x_first, y_first, found = first_intersection(x1, y1, x2, y2)
+    assert shape == (len(cases),)
+    for item in range(0, len(cases)):
+        x_ref, y_ref = intersect.intersection(x1[item], y1[item], x2[item],
+                                              y2[item])
+        np.testing.assert_array_equal(x[batch == item], x_ref)
+        np.testing.assert_array_equal(y[batch == item], y_ref)
+        assert found[item] == (len(x_ref) > 0)
+        if found[item]:
+            assert (x_first[item], y_first[item]) == (x_ref[0], y_ref[0])
+
+
+def test_spanwise_curves_match_intersect():
+    intersect = pytest.importorskip('intersect')
+    x1, y1, x2, y2 = spanwise_curves()
+    batch, x_all, y_all, shape = intersections(x1, y1, x2, y2)
+    x, y, found = first_intersection(x1, y1, x2, y2)
+    batch = np.unravel_index(batch, shape)
+    n_crossings = 0
+    for layer in range(0, 3):
+        for curve in range(0, 4):
+            for rib in range(0, 25):
+                x_ref, y_ref = intersect.intersection(
+                    x1[layer, curve, 0], y1[layer, curve, 0],
+                    x2[layer, 0, rib], y2[layer, 0, rib])
+                pair = (batch[0] == layer) & (batch[1] == curve) & \
+                    (batch[2] == rib)
+                np.testing.assert_array_equal(x_all[pair], x_ref)
+                np.testing.assert_array_equal(y_all[pair], y_ref)
+                assert found[layer, curve, rib] == (len(x_ref) > 0)
+                if len(x_ref):
+                    assert x[layer, curve, rib] == x_ref[0]
+                    assert y[layer, curve, rib] == y_ref[0]
+                n_crossings += len(x_ref)
+    assert n_crossings > 100
+
+
+def test_no_pairs():
+    batch, x, y, shape = intersections(np.zeros((0, 3)), np.zeros((0, 3)),
+                                       np.zeros((0, 2)), np.zeros((0, 2)))
+    assert shape == (0,) and len(batch) == len(x) == len(y) == 0
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+import pytest
+import stage_graph
+from stage_cache import StageCache
+from stage_graph import StageGraph, code_fingerprint
+from tcl_writer import TclWriter
+
+
+@dataclass
+class Design:
+    n_ribs: int = 3
+    n_spars: int = 2
+
+
+def stage_ribs(parameters):
+    return {'ribs': list(range(0, parameters.n_ribs))}
+
+
+def stage_ribs_changed(parameters):
+    return {'ribs': list(range(1, parameters.n_ribs + 1))}
+
+
+def emit_ribs(file, ribs):
+    file.write(''.join('*rib %d\n' % rib for rib in ribs))
+    return {}
+
+
+def run_design(cache, function, design):
+    graph = StageGraph(cache)
+    graph.start(parameters=design)
+    outputs = graph.run('ribs', function)
+    return outputs, graph.runs[0]['source']
+
+
+def test_stored_stages_are_found_by_new_graphs(tmp_path):
+    cache = StageCache(str(tmp_path), data_key='data')
+    assert run_design(cache, stage_ribs, Design())[1] == 'run'
+    outputs, source = run_design(cache, stage_ribs, Design(n_spars=5))
+    assert source == 'disk'
+    assert outputs == {'ribs': [0, 1, 2]}
+    assert run_design(cache, stage_ribs, Design(n_ribs=4))[1] == 'run'
+
+
+def test_changed_code_is_not_served_from_the_cache(tmp_path):
+    assert code_fingerprint(stage_ribs) != \
+        code_fingerprint(stage_ribs_changed)
+    cache = StageCache(str(tmp_path), data_key='data')
+    run_design(cache, stage_ribs, Design())
+    outputs, source = run_design(cache, stage_ribs_changed, Design())
+    assert source == 'run'
+    assert outputs == {'ribs': [1, 2, 3]}
+
+
+def test_changed_data_is_not_served_from_the_cache(tmp_path):
+    run_design(StageCache(str(tmp_path), data_key='data'), stage_ribs,
+               Design())
+    cache = StageCache(str(tmp_path), data_key='new data')
+    assert run_design(cache, stage_ribs, Design())[1] == 'run'
+
+
+def test_one_off_graph_runs_the_stages_directly(monkeypatch):
+    def no_fingerprint(*values):
+        raise AssertionError('A one-off graph computed a fingerprint')
+
+    monkeypatch.setattr(stage_graph, 'fingerprint', no_fingerprint)
+    graph = StageGraph(reuse=False)
+    graph.start(parameters=Design())
+    graph.put(offset=1)
+    file = TclWriter()
+    graph.run('ribs', stage_ribs)
+    graph.run('emit', emit_ribs, file)
+    assert file.getvalue() == '*rib 0\n*rib 1\n*rib 2\n'
+    assert [run['bytes'] for run in graph.runs] == [0, 21]
+    assert not graph.entries and not graph.reused()
+
+
+@pytest.mark.parametrize('reuse', [False, True])
+def test_reused_text_is_written_again(reuse):
+    graph = StageGraph(reuse=reuse)
+    texts = []
+    for design in (Design(), Design(n_spars=5)):
+        graph.start(parameters=design)
+        file = TclWriter()
+        graph.run('ribs', stage_ribs)
+        graph.run('emit', emit_ribs, file)
+        texts.append(file.getvalue())
+        assert [run['bytes'] for run in graph.runs] == [0, 21]
+    assert texts[0] == texts[1]
+    assert graph.reused() == (['ribs', 'emit'] if reuse else [])
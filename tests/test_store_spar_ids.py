@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from node_registry import NodeRegistry
+from store_spar_ids import SparsCapsIDs
+
+N_RIBS = 40
+N_NODES = 12
+
+
+def rib_curves(rng):
+    # Upper curve from the TE (x = 1) to the LE (x = 0), then the lower curve
+    # back to the TE, with the LE node repeated like the uCRM-9 ribs
+    upper = np.sort(rng.uniform(0, 1, (3, N_RIBS, N_NODES)), axis=2)[..., ::-1]
+    upper[..., 0], upper[..., -1] = 1.0, 0.0
+    lower = np.sort(rng.uniform(0, 1, (3, N_RIBS, N_NODES)), axis=2)
+    lower[..., 0], lower[..., -1] = 0.0, 1.0
+    coord_x = np.concatenate((upper, lower), axis=2)
+    # A few curves that aren't monotonic
+    coord_x[:, 0:4] += rng.uniform(-0.2, 0.2, (3, 4, 2 * N_NODES))
+    return (coord_x, rng.uniform(-1, 1, coord_x.shape),
+            rng.uniform(5, 6, coord_x.shape))
+
+
+def desired_values(rng, coord_x, n_values):
+    desired = rng.uniform(-0.1, 1.1, (3, N_RIBS, n_values))
+    # Values close together (several in the window of one node)
+    desired[:, 4:12] = desired[:, 4:12, 0:1] + \
+        rng.uniform(-0.01, 0.01, (3, 8, n_values))
+    # Duplicates, and a spar with caps of zero width
+    desired[:, 12:16, -1] = desired[:, 12:16, 0]
+    # Values on the nodes and at the ends of the curves
+    nodes = rng.integers(0, 2 * N_NODES, (3, 4, n_values))
+    desired[:, 16:20] = np.take_along_axis(coord_x[:, 16:20], nodes, axis=2)
+    desired[:, 20:24] = rng.choice([0.0, 1.0, -0.5, 1.5], (3, 4, n_values))
+    return desired
+
+
+def scanned(coords, desired, upper):
+    # The reference: the node by node scan of every rib
+    coord_x, coord_y, coord_z = (coord.copy() for coord in coords)
+    registry = NodeRegistry()
+    registry.allocate('rib', coord_x.shape)
+    first, last = (0, N_NODES - 1) if upper else (N_NODES, 2 * N_NODES - 2)
+    id_s = np.zeros(desired.shape, dtype=int)
+    for l in range(0, 3):
+        for i in range(0, N_RIBS):
+            k, inserted = SparsCapsIDs.scan_nodes(
+                coord_x[l, i], coord_y[l, i], coord_z[l, i], desired[l, i],
+                first, last, upper)
+            id_s[l, i] = np.where(inserted,
+                                  registry.id_of('rib', (l, i, k)), 0)
+    return id_s, (coord_x, coord_y, coord_z)
+
+
+def inserted(coords, desired, upper):
+    ids = SparsCapsIDs.__new__(SparsCapsIDs)
+    ids.coord_x, ids.coord_y, ids.coord_z = (coord.copy() for coord in coords)
+    ids.n_nodes = N_NODES
+    ids.n_ribs = N_RIBS
+    ids.registry = NodeRegistry()
+    ids.registry.allocate('rib', ids.coord_x.shape)
+    return ids.insert_nodes(desired, upper), \
+        (ids.coord_x, ids.coord_y, ids.coord_z)
+
+
+@pytest.mark.parametrize('upper', [False, True])
+@pytest.mark.parametrize('n_values', [1, 3])
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_insert_nodes_matches_the_scan(seed, n_values, upper):
+    rng = np.random.default_rng(seed)
+    coords = rib_curves(rng)
+    desired = desired_values(rng, coords[0], n_values)
+    expected_ids, expected_coords = scanned(coords, desired, upper)
+    id_s, result_coords = inserted(coords, desired, upper)
+    np.testing.assert_array_equal(id_s, expected_ids)
+    for result, expected in zip(result_coords, expected_coords):
+        np.testing.assert_array_equal(result, expected)
+    # Most values are inserted
+    assert np.count_nonzero(id_s) > id_s.size // 2
@@ -0,0 +1,77 @@
+import io
+import numpy as np
+import pytest
+import surface_classes
+import triple_surface_classes
+
+LOOP = "\n*surfacesplineonlinesloop 1 1 0 %d\n"
+
+
+def commands(lists, prefix="*surfacemode 4\n*createmark lines 1 ",
+             suffix=LOOP % 65):
+    # The text of the loops over the surfaces, one list of IDs at a time
+    return ''.join(prefix + ' '.join(map(str, ids)) + suffix
+                   for ids in lists)
+
+
+def id_tables(shape, n_tables, dtype=np.int32):
+    size = int(np.prod(shape))
+    return [np.arange(1, size + 1, dtype=dtype).reshape(shape) + 100 * t
+            for t in range(0, n_tables)]
+
+
+@pytest.mark.parametrize('dtype', [np.int32, float])
+def test_skin_surfaces(dtype):
+    ids_1, ids_2, ids_3, ids_4 = id_tables((4, 5), 4, dtype)
+    file = io.StringIO()
+    skin = surface_classes.SkinSurfaces(3, 4, ids_1, ids_2, ids_3, ids_4, 9,
+                                        file)
+    assert file.getvalue() == commands(
+        [[ids_1[i, j], ids_2[i + 1, j], ids_3[i, j + 1], ids_4[i, j]]
+         for i in range(0, 3) for j in range(0, 4)])
+    assert skin.surfaces.ravel().tolist() == list(range(10, 22))
+    assert skin.surface_counter == 21
+
+
+def test_single_surfaces():
+    ids_1, ids_2 = id_tables((3,), 2)
+    ids_3, = id_tables((3, 1), 1)
+    file = io.StringIO()
+    surfaces = surface_classes.SingleSurfacesThreeCurves(3, ids_1, ids_2,
+                                                         ids_3, 0, file)
+    assert file.getvalue() == commands(
+        [[ids_1[i], ids_2[i], ids_3[i, 0]] for i in range(0, 3)])
+    assert surfaces.surfaces.ravel().tolist() == [1, 2, 3]
+
+
+def test_triple_surfaces():
+    ids_1, ids_2, ids_3, ids_4 = id_tables((2, 3, 4), 4)
+    file = io.StringIO()
+    surfaces = triple_surface_classes.MultipleSurfaces(
+        2, 3, 4, ids_1, ids_2, ids_3, ids_4, 5, file)
+    assert file.getvalue() == commands(
+        [[ids_1[i, j, k], ids_2[i, j, k], ids_3[i, j, k - 1], ids_4[i, j, k]]
+         for i in range(0, 2) for j in range(0, 3) for k in range(1, 4)],
+        suffix=LOOP % 67)
+    assert surfaces.surfaces.ravel().tolist() == list(range(6, 24))
+
+
+def test_rib_stiffeners():
+    ids = id_tables((2, 3), 4)
+    file = io.StringIO()
+    triple_surface_classes.RibStiffners(2, 3, *ids, 0, file)
+    assert file.getvalue() == commands(
+        [[table[i, j] for table in ids] for i in range(0, 2)
+         for j in range(0, 3)], "*surfacemode 4\n*createlist nodes 1 ",
+        "\n*surfacesplineonnodesloop2 1 0\n")
+
+
+def test_invalid_id_tables():
+    ids_1, ids_2, ids_3, ids_4 = id_tables((4, 5), 4)
+    with pytest.raises(ValueError):
+        surface_classes.SkinSurfaces(3, 4, ids_1, -ids_2, ids_3, ids_4, 0,
+                                     io.StringIO())
+    with pytest.raises(ValueError):
+        triple_surface_classes.StringerSurfaces(
+            2, 2, 2, *id_tables((2, 2, 2), 1), np.full((2, 2, 2), np.nan), 0,
+            io.StringIO())
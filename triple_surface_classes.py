@@ -1,4 +1,6 @@
 import numpy as np
+from node_registry import id_table
+from surface_classes import write_surfaces
 
 
 class MultipleSurfaces:
@@ -14,7 +16,7 @@ class MultipleSurfaces:
         self.ids_3 = ids_3
         self.ids_4 = ids_4
 
-        self.surfaces = np.zeros((self.n_1, self.n_2, self.n_3 - 1))
+        self.surfaces = id_table((self.n_1, self.n_2, self.n_3 - 1))
         self.surface_counter = surface_counter
 
         self.write_tcl(file)
@@ -27,17 +29,11 @@ class MultipleSurfaces:
         return my_list
 
     def write_tcl(self, file):
-        for i in range(0, self.n_1):
-            for j in range(0, self.n_2):
-                for k in range(0, self.n_3):
-                    if k != 0:
-                        my_list = self.list_creation(i, j, k)
-                        my_str = ' '.join(map(str, my_list))
-                        cmd = "*surfacemode 4\n*createmark lines 1 " + my_str
-                        file.write(cmd)
-                        file.write("\n*surfacesplineonlinesloop 1 1 0 67\n")
-                        self.surface_counter += 1
-                        self.surfaces[i, j, k - 1] = self.surface_counter
+        write_surfaces(self, np.ix_(range(0, self.n_1), range(0, self.n_2),
+                                    range(1, self.n_3)),
+                       (self.n_1, self.n_2, self.n_3 - 1),
+                       "*surfacemode 4\n*createmark lines 1 ",
+                       "\n*surfacesplineonlinesloop 1 1 0 67\n", file)
 
 
 class StringerSurfaces(MultipleSurfaces):
@@ -51,7 +47,7 @@ class StringerSurfaces(MultipleSurfaces):
         self.ids_1 = ids_1
         self.ids_2 = ids_2
 
-        self.surfaces = np.zeros((self.n_1, self.n_2, self.n_3))
+        self.surfaces = id_table((self.n_1, self.n_2, self.n_3))
         self.surface_counter = surface_counter
 
         self.write_tcl(file)
@@ -63,16 +59,11 @@ class StringerSurfaces(MultipleSurfaces):
         return my_list
 
     def write_tcl(self, file):
-        for i in range(0, self.n_1):
-            for j in range(0, self.n_2):
-                for k in range(0, self.n_3):
-                    my_list = self.list_creation(i, j, k)
-                    my_str = ' '.join(map(str, my_list))
-                    cmd = "*surfacemode 4\n*createmark lines 1 " + my_str
-                    file.write(cmd)
-                    file.write("\n*surfacesplineonlinesloop 1 1 0 67\n")
-                    self.surface_counter += 1
-                    self.surfaces[i, j, k] = self.surface_counter
+        write_surfaces(self, np.ix_(range(0, self.n_1), range(0, self.n_2),
+                                    range(0, self.n_3)),
+                       (self.n_1, self.n_2, self.n_3),
+                       "*surfacemode 4\n*createmark lines 1 ",
+                       "\n*surfacesplineonlinesloop 1 1 0 67\n", file)
 
 
 class RibStiffners:
@@ -87,8 +78,8 @@ class RibStiffners:
         self.ids_3 = ids_3
         self.ids_4 = ids_4
 
-        self.surfaces = np.zeros((self.n_1, self.n_2))
-        self.components = np.zeros((self.n_1, 1))
+        self.surfaces = id_table((self.n_1, self.n_2))
+        self.components = id_table((self.n_1, 1))
         self.surface_counter = surface_counter
 
         self.write_tcl(file)
@@ -101,12 +92,7 @@ class RibStiffners:
         return my_list
 
     def write_tcl(self, file):
-        for i in range(0, self.n_1):
-            for j in range(0, self.n_2):
-                my_list = self.list_creation(i, j)
-                my_str = ' '.join(map(str, my_list))
-                cmd = "*surfacemode 4\n*createlist nodes 1 " + my_str
-                file.write(cmd)
-                file.write("\n*surfacesplineonnodesloop2 1 0\n")
-                self.surface_counter += 1
-                self.surfaces[i, j] = self.surface_counter
+        write_surfaces(self, np.ix_(range(0, self.n_1), range(0, self.n_2)),
+                       (self.n_1, self.n_2),
+                       "*surfacemode 4\n*createlist nodes 1 ",
+                       "\n*surfacesplineonnodesloop2 1 0\n", file)
@@ -0,0 +1,237 @@
+"""
+A script that keeps the uCRM-9 wing database once per process.
+
+The UCRM class reads the 21 airfoils of the wing. Since the result depends only
+on the resource files, consumers should obtain it through get_wing(), which
+builds it on first use and shares it afterwards. Call invalidate() after
+changing the resource files to force a reload.
+
+The OML surface interpolator (get_surface()) is built from the same database,
+so it doesn't depend on the design either and is shared the same way.
+
+Advices:
+- You must have a 'Resources/uCRM_9/uCRM_9_Airfoil_Data/' path containing
+the airfoil data
+
+"""
+import math
+import numpy
+from read_oml import read_oml, oml_data
+from airfoil_cache import Y_PERCENT, read_profile, read_profiles
+
+_WING = None
+_SURFACE = None
+
+
+class Airfoil:
+    """
+    Airfoil Class.
+
+    Defines a class that contains all the necessary instance attributes and a
+    method for reading, translating and rotating the airfoil's coordinates
+    """
+
+    def __init__(self, percent, x_origin, y_origin, z_origin, twist, chord):
+        self.percent = percent
+        self.X = x_origin
+        self.Y = y_origin
+        self.Z = z_origin
+        self.twist = twist
+        self.c = chord
+
+    def read_airfoil(self, profiles=None):
+        """
+        It's a method for the extraction of airfoil's data and transformation.
+
+        Parameters
+        ----------
+        profiles : The stack of all profiles (see airfoil_cache). If None,
+        the profile is taken from the binary cache.
+
+        Returns
+        -------
+        x, y, z: The coordinates after rotation, translation and scaling
+        """
+        if profiles is None:
+            x_airfoil, z_airfoil = read_profile(self.percent)
+        else:
+            x_airfoil, z_airfoil = numpy.array(
+                profiles[Y_PERCENT.index(self.percent)])
+        # Modify the TE of Lower curve to match the upper (sharp TE)
+        x_airfoil[-1] = x_airfoil[0]
+        z_airfoil[-1] = z_airfoil[0]
+        # Rotate the coordinates of airfoil
+        x = x_airfoil * math.cos(self.twist) - z_airfoil * math.sin(self.twist)
+        z = z_airfoil * math.cos(self.twist) + x_airfoil * math.sin(self.twist)
+        # Transform
+        x = x * self.c + self.X
+        y = self.Y
+        z = z * self.c + self.Z
+        return x, y, z
+
+
+class UCRM:
+    """
+    uCRM_9 Class.
+
+    It's a class that contains the coordinates of uCRM_9 wing.
+    """
+
+    def __init__(self):
+
+        # Read the coordinates
+        x, y, z, aoa, c = read_oml()
+        # Appending airfoil instances to airfoil_list
+        airfoil_list = []
+        self.x = numpy.zeros((240, 21))
+        self.y = numpy.zeros((240, 21))
+        self.z = numpy.zeros((240, 21))
+        self.chord = numpy.transpose(c)
+        self.twist = numpy.transpose(aoa)
+        # The binary (memory-mapped) stack of the airfoil profiles
+        profiles = read_profiles()
+
+        for i in range(0, 21):
+            airfoil_list.append(Airfoil(Y_PERCENT[i], x[i], y[i], z[i],
+                                        aoa[i], c[i]))
+            self.x[:, i], self.y[:, i], self.z[:, i] =\
+                airfoil_list[i].read_airfoil(profiles)
+
+
+def get_wing():
+    """
+    It's a function that returns the shared uCRM-9 wing database.
+
+    The arrays of the returned instance are read-only, since it's shared by
+    every consumer in the process.
+
+    Returns
+    -------
+    wing : The UCRM instance.
+    """
+    global _WING
+    if _WING is None:
+        wing = UCRM()
+        for value in vars(wing).values():
+            value.flags.writeable = False
+        _WING = wing
+    return _WING
+
+
+class OmlSurface:
+    """
+    OML surface Class.
+
+    It's a class that interpolates the Z of the upper and lower surface of the
+    wing at any XY points. The surface is ruled between the 21 airfoils: each
+    point of an airfoil is joined linearly with the same point of the next
+    airfoil, like the spanwise interpolation of the ribs. No triangulation is
+    needed, so the interpolator depends only on the database.
+    """
+
+    def __init__(self, wing):
+        self.y_stations = numpy.array(wing.y[0, :])
+        # Sections in increasing X: upper from the LE to the TE, lower from
+        # the first point after the LE to the TE
+        x_upper, z_upper = wing.x[119::-1, :].T, wing.z[119::-1, :].T
+        x_lower, z_lower = wing.x[120:240, :].T, wing.z[120:240, :].T
+        self.x = numpy.stack((x_upper, x_lower))
+        self.z = numpy.stack((z_upper, z_lower))
+        for value in vars(self).values():
+            value.flags.writeable = False
+
+    def interpolate_section(self, surface, x, y):
+        """
+        It's a method that interpolates the Z of one surface at the XY points.
+
+        The station segment of each point is found by its Y and the chord
+        segment by a bisection on the ruled section, so only the neighbouring
+        points of each request are interpolated.
+
+        Parameters
+        ----------
+        surface : 0 for the upper and 1 for the lower surface.
+        x, y : 1D arrays of the desired XY points.
+
+        Returns
+        -------
+        z : The interpolated Z. Points beyond the LE or TE take the value of
+        the edge.
+        """
+        x_stations = self.x[surface]
+        z_stations = self.z[surface]
+        m = x_stations.shape[1]
+        i = numpy.clip(numpy.searchsorted(self.y_stations, y, side='right')
+                       - 1, 0, len(self.y_stations) - 2)
+        t = (y - self.y_stations[i]) / (self.y_stations[i + 1] -
+                                        self.y_stations[i])
+
+        def section(values, j):
+            return values[i, j] * (1 - t) + values[i + 1, j] * t
+
+        # Bisection for the last section point with X <= x
+        low = numpy.zeros(len(x), dtype=numpy.intp)
+        high = numpy.full(len(x), m - 1, dtype=numpy.intp)
+        while numpy.any(high - low > 1):
+            middle = (low + high) // 2
+            below = section(x_stations, middle) <= x
+            low = numpy.where(below, middle, low)
+            high = numpy.where(below, high, middle)
+
+        x_0 = section(x_stations, low)
+        x_1 = section(x_stations, low + 1)
+        z_0 = section(z_stations, low)
+        z_1 = section(z_stations, low + 1)
+        z = z_0 + (z_1 - z_0) * (x - x_0) / (x_1 - x_0)
+        z = numpy.where(x < x_0, z_0, z)
+        return numpy.where(x > x_1, z_1, z)
+
+    def evaluate(self, x, y):
+        """
+        It's a method that returns the Z of both surfaces at the XY points.
+
+        Parameters
+        ----------
+        x, y : Arrays of the same shape with the desired XY points.
+
+        Returns
+        -------
+        z_upper, z_lower: The Z of the upper and lower surface (same shape as
+        x).
+        """
+        x = numpy.asarray(x, dtype=float)
+        shape = x.shape
+        x = x.ravel()
+        y = numpy.asarray(y, dtype=float).ravel()
+        return (self.interpolate_section(0, x, y).reshape(shape),
+                self.interpolate_section(1, x, y).reshape(shape))
+
+
+def get_surface():
+    """
+    It's a function that returns the shared OML surface interpolator.
+
+    Returns
+    -------
+    surface : The OmlSurface instance of the shared wing database.
+    """
+    global _SURFACE
+    if _SURFACE is None:
+        _SURFACE = OmlSurface(get_wing())
+    return _SURFACE
+
+
+def invalidate():
+    """
+    It's a function that drops the shared wing database, surface and OML data.
+
+    The next get_wing() call reads them again from the resource files.
+
+    Returns
+    -------
+    None.
+    """
+    global _WING, _SURFACE
+    _WING = None
+    _SURFACE = None
+    oml_data.cache_clear()